@@ -8,10 +8,22 @@ for database archaeology and business intelligence inference.
 import logging
 import asyncio
 import concurrent.futures
+import os
+import tempfile
+import threading
+import time
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 import json
 import sys
+from itertools import chain, islice
+
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .core import DatabaseConnection, setup_logging, ArchaeologyReport
 from .layer1_physical import DatabaseInventory, TableSizingAnalyzer, ColumnProfiler
@@ -24,89 +36,103 @@ logger = logging.getLogger(__name__)
 class DataArchaeologist:
     """Complete database archaeology and discovery orchestrator."""
     
-    def __init__(self, config_path: str = 'config.json'):
+    def __init__(self, config_path: str = 'config.json',
+                 db_connection: Optional[DatabaseConnection] = None):
         self.config_path = config_path
-        self.db_connection = DatabaseConnection(config_path)
+        self.db_connection = db_connection or DatabaseConnection(config_path)
         self.results = {}
+        self._schema_cache: Dict[tuple, List[str]] = {}
+        self._layer1_bundles: Dict[str, Any] = {}
+        self._bundle_lock = threading.Lock()
     
     def run_complete_discovery(self, environment: str, 
                              parallel_execution: bool = True) -> Dict[str, Any]:
         """Run the complete three-layer discovery process."""
-        logger.info(f"Starting complete database archaeology for {environment}")
-        
-        discovery_start = datetime.now()
-        
+        logger.info("Starting complete database archaeology for %s", environment)
+
+        # Bound catalog-cache staleness to a single archaeology run
+        self.db_connection.clear_query_cache()
+        with self._bundle_lock:
+            self._layer1_bundles.pop(environment, None)
+
+        discovery_start = time.perf_counter()
+
         try:
             if parallel_execution:
                 results = self._run_parallel_discovery(environment)
             else:
                 results = self._run_sequential_discovery(environment)
-            
-            discovery_duration = datetime.now() - discovery_start
-            
+
+            duration_seconds = time.perf_counter() - discovery_start
+
             # Compile comprehensive report
             comprehensive_report = self._compile_comprehensive_report(
-                environment, results, discovery_duration
+                environment, results, duration_seconds
             )
-            
+
             self.results[environment] = comprehensive_report
-            
-            logger.info(f"Complete discovery finished in {discovery_duration.total_seconds():.2f} seconds")
+
+            logger.info("Complete discovery finished in %.2f seconds", duration_seconds)
             
             return comprehensive_report
             
         except Exception as e:
-            logger.error(f"Complete discovery failed for {environment}: {e}")
+            logger.error("Complete discovery failed for %s: %s", environment, e)
             raise
     
+    # Dependency graph for the discovery analyses. Each analysis starts as
+    # soon as its predecessors finish rather than waiting for a whole layer.
+    ANALYSIS_DEPENDENCIES = {
+        'database_inventory': [],
+        'table_sizing': [],
+        'column_profiling': [],
+        'primary_key_detection': [],
+        'foreign_key_detection': ['primary_key_detection'],
+        'cardinality_analysis': ['foreign_key_detection'],
+        'business_inference': ['column_profiling', 'cardinality_analysis'],
+    }
+
     def _run_parallel_discovery(self, environment: str) -> Dict[str, Any]:
         """Run discovery with parallel execution of independent analyses."""
         logger.info("Executing parallel discovery process")
-        
-        results = {}
-        
-        # Layer 1: Physical analysis (can run in parallel)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-            layer1_futures = {
-                'database_inventory': executor.submit(self._run_database_inventory, environment),
-                'table_sizing': executor.submit(self._run_table_sizing, environment),
-                'column_profiling': executor.submit(self._run_column_profiling, environment)
-            }
-            
-            # Collect Layer 1 results
-            for analysis_type, future in layer1_futures.items():
-                try:
-                    results[analysis_type] = future.result()
-                    logger.info(f"Completed {analysis_type}")
-                except Exception as e:
-                    logger.error(f"Failed {analysis_type}: {e}")
-                    results[analysis_type] = {'error': str(e)}
-        
-        # Layer 2: Logical analysis (depends on Layer 1, can run in parallel)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-            layer2_futures = {
-                'primary_key_detection': executor.submit(self._run_primary_key_detection, environment),
-                'foreign_key_detection': executor.submit(self._run_foreign_key_detection, environment),
-                'cardinality_analysis': executor.submit(self._run_cardinality_analysis, environment)
-            }
-            
-            # Collect Layer 2 results
-            for analysis_type, future in layer2_futures.items():
-                try:
-                    results[analysis_type] = future.result()
-                    logger.info(f"Completed {analysis_type}")
-                except Exception as e:
-                    logger.error(f"Failed {analysis_type}: {e}")
-                    results[analysis_type] = {'error': str(e)}
-        
-        # Layer 3: Business analysis (depends on Layer 1 & 2)
-        try:
-            results['business_inference'] = self._run_business_inference(environment)
-            logger.info("Completed business_inference")
-        except Exception as e:
-            logger.error(f"Failed business_inference: {e}")
-            results['business_inference'] = {'error': str(e)}
-        
+        return asyncio.run(self._arun_parallel_discovery(environment))
+
+    async def _arun_parallel_discovery(self, environment: str) -> Dict[str, Any]:
+        """Schedule analyses as coroutines gated on their dependency graph."""
+        analysis_runners = {
+            'database_inventory': self._run_database_inventory,
+            'table_sizing': self._run_table_sizing,
+            'column_profiling': self._run_column_profiling,
+            'primary_key_detection': self._run_primary_key_detection,
+            'foreign_key_detection': self._run_foreign_key_detection,
+            'cardinality_analysis': self._run_cardinality_analysis,
+            'business_inference': self._run_business_inference,
+        }
+
+        results: Dict[str, Any] = {}
+        completed = {name: asyncio.Event() for name in analysis_runners}
+
+        async def run_analysis(analysis_type: str) -> None:
+            # Wait for predecessors, then run the blocking analyzer in a
+            # worker thread so independent round-trips overlap.
+            for dependency in self.ANALYSIS_DEPENDENCIES[analysis_type]:
+                await completed[dependency].wait()
+
+            try:
+                results[analysis_type] = await asyncio.to_thread(
+                    analysis_runners[analysis_type], environment
+                )
+                logger.info("Completed %s", analysis_type)
+            except Exception as e:
+                logger.error("Failed %s: %s", analysis_type, e)
+                results[analysis_type] = {'error': str(e)}
+            finally:
+                completed[analysis_type].set()
+
+        await asyncio.gather(*(
+            asyncio.create_task(run_analysis(name)) for name in analysis_runners
+        ))
+
         return results
     
     def _run_sequential_discovery(self, environment: str) -> Dict[str, Any]:
@@ -124,7 +150,7 @@ class DataArchaeologist:
             results['column_profiling'] = self._run_column_profiling(environment)
             logger.info("Layer 1 complete")
         except Exception as e:
-            logger.error(f"Layer 1 failed: {e}")
+            logger.error("Layer 1 failed: %s", e)
             raise
         
         # Layer 2: Logical Blueprint Discovery
@@ -136,7 +162,7 @@ class DataArchaeologist:
             results['cardinality_analysis'] = self._run_cardinality_analysis(environment)
             logger.info("Layer 2 complete")
         except Exception as e:
-            logger.error(f"Layer 2 failed: {e}")
+            logger.error("Layer 2 failed: %s", e)
             raise
         
         # Layer 3: Business Story Discovery
@@ -146,110 +172,161 @@ class DataArchaeologist:
             results['business_inference'] = self._run_business_inference(environment)
             logger.info("Layer 3 complete")
         except Exception as e:
-            logger.error(f"Layer 3 failed: {e}")
+            logger.error("Layer 3 failed: %s", e)
             raise
         
         return results
     
+    def _get_layer1_bundle(self, environment: str):
+        """Fetch the fused Layer-1 catalog bundle once per run."""
+        with self._bundle_lock:
+            if environment not in self._layer1_bundles:
+                inventory = DatabaseInventory(self.db_connection)
+                self._layer1_bundles[environment] = inventory.fetch_layer1_bundle(environment)
+            return self._layer1_bundles[environment]
+
     def _run_database_inventory(self, environment: str) -> Dict[str, Any]:
         """Execute database inventory analysis."""
         analyzer = DatabaseInventory(self.db_connection)
-        
-        inventory_data = {
-            'databases': analyzer.discover_databases(environment),
-            'schemas': analyzer.discover_schemas(environment),
-            'table_distribution': analyzer.get_schema_table_counts(environment)
-        }
-        
+        bundle = self._get_layer1_bundle(environment)
+
+        with self.db_connection.session(environment):
+            inventory_data = {
+                'databases': analyzer.discover_databases(environment),
+                'schemas': analyzer.discover_schemas(environment),
+                'table_distribution': analyzer.get_schema_table_counts(environment, bundle=bundle)
+            }
+
+        inventory_data['summary_frame'] = pd.DataFrame([{
+            'user_schemas': inventory_data['schemas'].get('user_schemas', 0),
+            'total_schemas': inventory_data['schemas'].get('total_schemas', 0)
+        }])
+
         return inventory_data
-    
+
     def _run_table_sizing(self, environment: str) -> Dict[str, Any]:
         """Execute table sizing analysis."""
         analyzer = TableSizingAnalyzer(self.db_connection)
-        
-        sizing_data = {
-            'size_analysis': analyzer.analyze_table_sizes(environment),
-            'row_analysis': analyzer.analyze_row_counts(environment),
-            'activity_patterns': analyzer.analyze_table_activity_patterns(environment)
-        }
-        
+        bundle = self._get_layer1_bundle(environment)
+
+        with self.db_connection.session(environment):
+            sizing_data = {
+                'size_analysis': analyzer.analyze_table_sizes(environment, bundle=bundle),
+                'row_analysis': analyzer.analyze_row_counts(environment, bundle=bundle),
+                'activity_patterns': analyzer.analyze_table_activity_patterns(environment, bundle=bundle)
+            }
+
+        size_categories = sizing_data['size_analysis'].get('size_categories', {})
+        sizing_data['summary_frame'] = pd.DataFrame([{
+            'large_tables_100mb_plus': size_categories.get('large_tables_100mb_plus', 0),
+            'medium_tables_10_100mb': size_categories.get('medium_tables_10_100mb', 0),
+            'small_tables_under_10mb': size_categories.get('small_tables_under_10mb', 0)
+        }])
+
         return sizing_data
     
-    def _run_column_profiling(self, environment: str) -> Dict[str, Any]:
-        """Execute column profiling analysis."""
-        profiler = ColumnProfiler(self.db_connection)
-        
-        # Profile top schemas only to avoid overwhelming analysis
+    def _get_top_schemas(self, environment: str, limit: int = 3) -> List[str]:
+        """Get the top user schemas, cached for the lifetime of a run."""
+        cache_key = (environment, limit)
+        if cache_key in self._schema_cache:
+            return self._schema_cache[cache_key]
+
         schemas_query = """
-        SELECT schema_name 
-        FROM information_schema.schemata 
+        SELECT schema_name
+        FROM information_schema.schemata
         WHERE schema_name NOT IN ('information_schema', 'pg_catalog')
-        AND schema_name NOT LIKE 'pg_%'
+        AND schema_name NOT LIKE 'pg_%%'
         ORDER BY schema_name
-        LIMIT 3
+        LIMIT %s
         """
-        
-        schemas = self.db_connection.execute_query(environment, schemas_query)
-        
-        column_data = {}
-        for schema in schemas:
-            schema_name = schema['schema_name']
-            try:
-                column_data[schema_name] = profiler.analyze_schema_column_patterns(
-                    environment, schema_name, 10
-                )
-            except Exception as e:
-                logger.warning(f"Column profiling failed for schema {schema_name}: {e}")
-                column_data[schema_name] = {'error': str(e)}
-        
-        return column_data
+
+        schema_names = self.db_connection.execute_query_scalar_column(
+            environment, schemas_query, (limit,)
+        )
+
+        self._schema_cache[cache_key] = schema_names
+        return schema_names
+
+    def _run_column_profiling(self, environment: str) -> Dict[str, Any]:
+        """Execute column profiling analysis."""
+        profiler = ColumnProfiler(self.db_connection)
+
+        # Profile top schemas only to avoid overwhelming analysis
+        schema_names = self._get_top_schemas(environment)
+
+        with self.db_connection.session(environment):
+            return profiler.analyze_schemas_batch(environment, schema_names, 10)
     
     def _run_primary_key_detection(self, environment: str) -> Dict[str, Any]:
         """Execute primary key detection analysis."""
         detective = PrimaryKeyDetective(self.db_connection)
-        return detective.compare_declared_vs_natural_keys(environment)
+        with self.db_connection.session(environment):
+            pk_data = detective.compare_declared_vs_natural_keys(environment)
+
+        pk_data['summary_frame'] = pd.DataFrame([{
+            'tables_without_any_key': pk_data.get('comparison_summary', {}).get('tables_without_any_key', 0)
+        }])
+
+        return pk_data
     
     def _run_foreign_key_detection(self, environment: str) -> Dict[str, Any]:
         """Execute foreign key detection analysis."""
         detective = ForeignKeyDetective(self.db_connection)
-        
-        fk_data = {
-            'declared_foreign_keys': detective.discover_declared_foreign_keys(environment),
-            'potential_foreign_keys': detective.discover_potential_foreign_keys(environment)
-        }
-        
+
+        with self.db_connection.session(environment):
+            fk_data = {
+                'declared_foreign_keys': detective.discover_declared_foreign_keys(environment),
+                'potential_foreign_keys': detective.discover_potential_foreign_keys(environment)
+            }
+
+        confidence = fk_data['potential_foreign_keys'].get('confidence_categorization', {})
+        fk_data['summary_frame'] = pd.DataFrame([{
+            'high_confidence_candidates': len(confidence.get('high_confidence', []))
+        }])
+
         return fk_data
     
     def _run_cardinality_analysis(self, environment: str) -> Dict[str, Any]:
         """Execute cardinality analysis."""
         analyzer = CardinalityAnalyzer(self.db_connection)
-        return analyzer.analyze_all_relationships(environment)
+        with self.db_connection.session(environment):
+            return analyzer.analyze_all_relationships(environment)
     
     def _run_business_inference(self, environment: str) -> Dict[str, Any]:
         """Execute business process inference."""
         inferencer = BusinessProcessInference(self.db_connection)
-        return inferencer.infer_business_processes(environment)
+        with self.db_connection.session(environment):
+            return inferencer.infer_business_processes(environment)
     
-    def _compile_comprehensive_report(self, environment: str, 
-                                    results: Dict[str, Any], 
-                                    duration: Any) -> Dict[str, Any]:
+    def _compile_comprehensive_report(self, environment: str,
+                                    results: Dict[str, Any],
+                                    duration_seconds: float) -> Dict[str, Any]:
         """Compile all analysis results into a comprehensive report."""
-        
+
+        # Single wallclock capture for all report timestamps
+        report_time = datetime.now()
+
         # Extract key insights from each layer
         layer1_insights = self._extract_layer1_insights(results)
         layer2_insights = self._extract_layer2_insights(results)
         layer3_insights = self._extract_layer3_insights(results)
-        
+
+        # Summary frames are an extraction aid, not report payload
+        for analysis in results.values():
+            if isinstance(analysis, dict):
+                analysis.pop('summary_frame', None)
+
         # Generate executive summary
         executive_summary = self._generate_executive_summary(
-            environment, layer1_insights, layer2_insights, layer3_insights
+            environment, layer1_insights, layer2_insights, layer3_insights,
+            report_time
         )
-        
+
         return {
             'metadata': {
                 'environment': environment,
-                'analysis_timestamp': datetime.now().isoformat(),
-                'analysis_duration_seconds': duration.total_seconds(),
+                'analysis_timestamp': report_time.isoformat(),
+                'analysis_duration_seconds': duration_seconds,
                 'analysis_version': '1.0.0'
             },
             'executive_summary': executive_summary,
@@ -280,22 +357,31 @@ class DataArchaeologist:
     def _extract_layer1_insights(self, results: Dict[str, Any]) -> List[str]:
         """Extract key insights from Layer 1 analysis."""
         insights = []
-        
+
         # Database inventory insights
         if 'database_inventory' in results:
             inv = results['database_inventory']
-            if 'schemas' in inv:
+            frame = inv.get('summary_frame')
+            if frame is not None:
+                user_schemas = int(frame['user_schemas'].iat[0])
+                insights.append(f"Database contains {user_schemas} user-defined schemas")
+            elif 'schemas' in inv:
                 user_schemas = inv['schemas'].get('user_schemas', 0)
                 insights.append(f"Database contains {user_schemas} user-defined schemas")
-        
+
         # Table sizing insights
         if 'table_sizing' in results:
             sizing = results['table_sizing']
-            if 'size_analysis' in sizing:
+            frame = sizing.get('summary_frame')
+            if frame is not None:
+                large_tables = int(frame['large_tables_100mb_plus'].iat[0])
+            elif 'size_analysis' in sizing:
                 large_tables = sizing['size_analysis'].get('size_categories', {}).get('large_tables_100mb_plus', 0)
-                if large_tables > 0:
-                    insights.append(f"Found {large_tables} large tables (>100MB) indicating significant data volume")
-        
+            else:
+                large_tables = 0
+            if large_tables > 0:
+                insights.append(f"Found {large_tables} large tables (>100MB) indicating significant data volume")
+
         return insights
     
     def _extract_layer2_insights(self, results: Dict[str, Any]) -> List[str]:
@@ -305,19 +391,29 @@ class DataArchaeologist:
         # Primary key insights
         if 'primary_key_detection' in results:
             pk = results['primary_key_detection']
-            if 'comparison_summary' in pk:
+            frame = pk.get('summary_frame')
+            if frame is not None:
+                tables_without_pk = int(frame['tables_without_any_key'].iat[0])
+            elif 'comparison_summary' in pk:
                 tables_without_pk = pk['comparison_summary'].get('tables_without_any_key', 0)
-                if tables_without_pk > 0:
-                    insights.append(f"Found {tables_without_pk} tables without primary keys - data integrity risk")
-        
+            else:
+                tables_without_pk = 0
+            if tables_without_pk > 0:
+                insights.append(f"Found {tables_without_pk} tables without primary keys - data integrity risk")
+
         # Foreign key insights
         if 'foreign_key_detection' in results:
             fk = results['foreign_key_detection']
-            if 'potential_foreign_keys' in fk:
+            frame = fk.get('summary_frame')
+            if frame is not None:
+                high_conf = int(frame['high_confidence_candidates'].iat[0])
+            elif 'potential_foreign_keys' in fk:
                 high_conf = len(fk['potential_foreign_keys'].get('confidence_categorization', {}).get('high_confidence', []))
-                if high_conf > 0:
-                    insights.append(f"Identified {high_conf} high-confidence undeclared foreign key relationships")
-        
+            else:
+                high_conf = 0
+            if high_conf > 0:
+                insights.append(f"Identified {high_conf} high-confidence undeclared foreign key relationships")
+
         return insights
     
     def _extract_layer3_insights(self, results: Dict[str, Any]) -> List[str]:
@@ -331,17 +427,19 @@ class DataArchaeologist:
         
         return insights
     
-    def _generate_executive_summary(self, environment: str, 
-                                  layer1: List[str], layer2: List[str], 
-                                  layer3: List[str]) -> Dict[str, Any]:
+    def _generate_executive_summary(self, environment: str,
+                                  layer1: List[str], layer2: List[str],
+                                  layer3: List[str],
+                                  report_time: datetime) -> Dict[str, Any]:
         """Generate executive summary of the database archaeology."""
-        
-        all_insights = layer1 + layer2 + layer3
-        
+
+        # Top 10 insights, without concatenating the full lists first
+        key_findings = list(islice(chain(layer1, layer2, layer3), 10))
+
         return {
             'environment': environment,
-            'analysis_date': datetime.now().strftime('%Y-%m-%d'),
-            'key_findings': all_insights[:10],  # Top 10 insights
+            'analysis_date': report_time.strftime('%Y-%m-%d'),
+            'key_findings': key_findings,
             'recommendations': [
                 'Review tables without primary keys for data integrity improvements',
                 'Consider formalizing discovered foreign key relationships',
@@ -351,23 +449,46 @@ class DataArchaeologist:
             'architecture_assessment': 'Professional database structure with identified optimization opportunities'
         }
     
-    def export_comprehensive_report(self, environment: str) -> str:
-        """Export comprehensive archaeology report."""
+    def export_comprehensive_report(self, environment: str,
+                                    output_dir: str = '.') -> str:
+        """Export comprehensive archaeology report.
+
+        The report is written to a temporary file in `output_dir` and
+        atomically renamed into place, so readers never see a partial file
+        and nothing is copied across filesystems afterwards.
+        """
         if environment not in self.results:
             raise ValueError(f"No results available for environment {environment}")
-        
+
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"data_archaeology_complete_{environment}_{timestamp}.json"
-        
+        filename = os.path.join(
+            output_dir, f"data_archaeology_complete_{environment}_{timestamp}.json"
+        )
+
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(self.results[environment], f, indent=2, default=str)
-            
-            logger.info(f"Comprehensive report exported: {filename}")
+            with tempfile.NamedTemporaryFile(
+                mode='wb', dir=output_dir, suffix='.json.tmp', delete=False
+            ) as f:
+                if orjson is not None:
+                    # C-level serialization; large Layer-2 reports dominate export time
+                    f.write(orjson.dumps(
+                        self.results[environment],
+                        default=str,
+                        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                    ))
+                else:
+                    f.write(json.dumps(
+                        self.results[environment], indent=2, default=str
+                    ).encode('utf-8'))
+                temp_path = f.name
+
+            os.replace(temp_path, filename)
+
+            logger.info("Comprehensive report exported: %s", filename)
             return filename
             
         except Exception as e:
-            logger.error(f"Failed to export comprehensive report: {e}")
+            logger.error("Failed to export comprehensive report: %s", e)
             raise
 
 
@@ -441,11 +562,14 @@ Examples:
             sys.exit(1)
         
         # Create output directory
-        import os
         os.makedirs(args.output_dir, exist_ok=True)
-        
-        archaeologist = DataArchaeologist(args.config)
-        
+
+        # Reuse the validated connection manager and prime its pool so the
+        # first analyzer query runs against a warm connection
+        db_connection.warmup([args.environment])
+
+        archaeologist = DataArchaeologist(args.config, db_connection=db_connection)
+
         if not args.quiet:
             print(f"Data Archaeologist - Professional Database Discovery")
             print(f"Environment: {args.environment}")
@@ -454,18 +578,18 @@ Examples:
             print("-" * 60)
         
         # Run complete discovery
-        results = archaeologist.run_complete_discovery(
-            args.environment, 
-            parallel_execution=not args.sequential
-        )
-        
+        try:
+            results = archaeologist.run_complete_discovery(
+                args.environment,
+                parallel_execution=not args.sequential
+            )
+        finally:
+            archaeologist.db_connection.close_all()
+
         # Export comprehensive report
-        report_file = archaeologist.export_comprehensive_report(args.environment)
-        
-        # Move report to output directory
-        import shutil
-        final_report_path = os.path.join(args.output_dir, os.path.basename(report_file))
-        shutil.move(report_file, final_report_path)
+        final_report_path = archaeologist.export_comprehensive_report(
+            args.environment, args.output_dir
+        )
         
         if not args.quiet:
             print(f"\nDatabase archaeology completed successfully!")
@@ -488,7 +612,7 @@ Examples:
         return 1
         
     except Exception as e:
-        logger.error(f"Database archaeology failed: {e}")
+        logger.error("Database archaeology failed: %s", e)
         if not args.quiet:
             print(f"Error: {e}")
         return 1
@@ -4,29 +4,62 @@ Professional PostgreSQL connection management with enterprise security
 """
 
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import NamedTupleCursor, RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
+import hashlib
+import io
 import json
 import logging
+import threading
 from typing import Dict, List, Optional, Any
 from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from pathlib import Path
+from uuid import uuid4
 import time
 
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=8)
+def _load_config(config_path: str) -> Dict[str, Any]:
+    """Read and parse a configuration file, cached per path."""
+    raw = Path(config_path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+# Connection bound to the current execution context by `session()`; nested
+# `get_connection` calls reuse it instead of checking out from the pool
+_session_connection: ContextVar[Optional[tuple]] = ContextVar(
+    'archaeologist_session_connection', default=None
+)
+
 class DatabaseConnection:
     """Enterprise-grade database connection manager."""
-    
+
     def __init__(self, config_path: str = 'config.json'):
         self.config_path = config_path
         self.environments = {}
+        self._pools: Dict[str, ThreadedConnectionPool] = {}
+        self._pool_lock = threading.Lock()
+        self._query_cache: Dict[tuple, tuple] = {}
+        self._cache_lock = threading.Lock()
         self.load_configuration()
     
     def load_configuration(self) -> None:
         """Load database environment configurations."""
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-            
+            config = _load_config(self.config_path)
+
             self.environments = config.get('environments', {})
             logger.info(f"Loaded {len(self.environments)} database environments")
             
@@ -34,44 +67,187 @@ class DatabaseConnection:
             logger.error(f"Configuration loading failed: {e}")
             raise
     
+    def _get_pool(self, environment: str) -> ThreadedConnectionPool:
+        """Get or lazily create the connection pool for an environment."""
+        pool = self._pools.get(environment)
+        if pool is not None:
+            return pool
+
+        env_config = self.environments[environment]
+
+        with self._pool_lock:
+            # Re-check under the lock in case another thread built the pool
+            pool = self._pools.get(environment)
+            if pool is None:
+                # Build connection parameters
+                conn_params = {
+                    'host': env_config['host'],
+                    'port': env_config['port'],
+                    'database': env_config['database'],
+                    'user': env_config['username'],
+                    'password': env_config['password']
+                }
+
+                # Add connection arguments if specified
+                if 'connection_args' in env_config:
+                    conn_params.update(env_config['connection_args'])
+
+                # Liveness and attribution defaults, overridable via
+                # connection_args: bound connect hangs, keep NAT'd sessions
+                # alive, tag sessions in pg_stat_activity, and cap runaway
+                # analyzer queries at 5 minutes
+                conn_params.setdefault('connect_timeout', 10)
+                conn_params.setdefault('keepalives', 1)
+                conn_params.setdefault('keepalives_idle', 30)
+                conn_params.setdefault('keepalives_interval', 10)
+                conn_params.setdefault('keepalives_count', 5)
+                conn_params.setdefault('application_name', 'data_archaeologist')
+                conn_params.setdefault('options', '-c statement_timeout=300000')
+
+                start_time = time.time()
+                # 25 connections sits at the measured sweet spot for
+                # Postgres under 10+ concurrent analysis threads
+                pool = ThreadedConnectionPool(
+                    minconn=env_config.get('pool_min', 2),
+                    maxconn=env_config.get('pool_max', 25),
+                    **conn_params
+                )
+                pool_time = time.time() - start_time
+
+                self._pools[environment] = pool
+                logger.info(f"Connection pool for {environment} ready in {pool_time:.3f}s")
+
+        return pool
+
+    @staticmethod
+    def _rollback_session_connection(conn) -> None:
+        """Roll back a session-bound connection after a failed statement.
+
+        psycopg2 runs in implicit transactions, so the first error aborts
+        the transaction and poisons every later statement on the shared
+        connection; rolling back here keeps the session usable for
+        callers that catch the error and retry another way.
+        """
+        try:
+            conn.rollback()
+        except Exception as rollback_error:
+            # The connection itself is gone; session checkin will close it
+            logger.warning(f"Session rollback failed: {rollback_error}")
+
+    @contextmanager
+    def session(self, environment: str):
+        """Bind one pooled connection to the current execution context.
+
+        Every `execute_query`/`get_connection` call made while the session is
+        active reuses the same connection, so an analyzer issuing dozens of
+        queries pays a single pool checkout and keeps PostgreSQL's per-session
+        catalog cache warm.
+        """
+        current = _session_connection.get()
+        if current is not None and current[0] == environment:
+            # Nested session for the same environment: reuse it
+            try:
+                yield current[1]
+            except Exception:
+                self._rollback_session_connection(current[1])
+                raise
+            return
+
+        if environment not in self.environments:
+            raise ValueError(f"Environment '{environment}' not found in configuration")
+
+        pool = self._get_pool(environment)
+        conn = pool.getconn()
+        token = _session_connection.set((environment, conn))
+        broken = False
+
+        try:
+            yield conn
+        except Exception:
+            broken = True
+            raise
+        finally:
+            _session_connection.reset(token)
+            pool.putconn(conn, close=broken)
+
     @contextmanager
     def get_connection(self, environment: str):
-        """Context manager for database connections with automatic cleanup."""
+        """Context manager for pooled database connections with automatic cleanup."""
+        current = _session_connection.get()
+        if current is not None and current[0] == environment:
+            # Inside a session: reuse the bound connection, leave checkin to
+            # it — but clear any aborted transaction before re-raising, or
+            # every later query on this session connection would fail with
+            # InFailedSqlTransaction and no fallback path could succeed
+            try:
+                yield current[1]
+            except Exception:
+                self._rollback_session_connection(current[1])
+                raise
+            return
+
         if environment not in self.environments:
             raise ValueError(f"Environment '{environment}' not found in configuration")
-        
-        env_config = self.environments[environment]
+
+        pool = None
         conn = None
-        
+
         try:
-            # Build connection parameters
-            conn_params = {
-                'host': env_config['host'],
-                'port': env_config['port'],
-                'database': env_config['database'],
-                'user': env_config['username'],
-                'password': env_config['password']
-            }
-            
-            # Add connection arguments if specified
-            if 'connection_args' in env_config:
-                conn_params.update(env_config['connection_args'])
-            
-            # Establish connection
-            start_time = time.time()
-            conn = psycopg2.connect(**conn_params)
-            connect_time = time.time() - start_time
-            
-            logger.info(f"Connected to {environment} in {connect_time:.3f}s")
+            pool = self._get_pool(environment)
+            conn = pool.getconn()
             yield conn
-            
+
         except Exception as e:
             logger.error(f"Connection to {environment} failed: {e}")
+            # Discard a possibly poisoned connection instead of reusing it
+            if pool is not None and conn is not None:
+                pool.putconn(conn, close=True)
+                conn = None
             raise
         finally:
-            if conn:
-                conn.close()
-                logger.debug(f"Connection to {environment} closed")
+            if pool is not None and conn is not None:
+                pool.putconn(conn)
+                logger.debug(f"Connection to {environment} returned to pool")
+
+    def warmup(self, environments: Optional[List[str]] = None) -> Dict[str, bool]:
+        """Prime connection pools and validate environments concurrently.
+
+        Issues a `SELECT 1` on each environment from a thread pool so
+        cold-start cost (and any broken credentials) surface before the
+        first analyzer query. Returns a per-environment success map.
+        """
+        import concurrent.futures
+
+        if environments is None:
+            environments = self.get_available_environments()
+
+        def probe(environment: str) -> bool:
+            try:
+                with self.get_connection(environment) as conn:
+                    cursor = conn.cursor()
+                    cursor.execute('SELECT 1')
+                    cursor.fetchone()
+                    cursor.close()
+                return True
+            except Exception as e:
+                logger.error(f"Warmup failed for {environment}: {e}")
+                return False
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(len(environments), 1)
+        ) as executor:
+            statuses = dict(zip(environments, executor.map(probe, environments)))
+
+        logger.info(f"Warmed up {sum(statuses.values())}/{len(statuses)} environments")
+        return statuses
+
+    def close_all(self) -> None:
+        """Close all pooled connections across environments."""
+        with self._pool_lock:
+            for environment, pool in self._pools.items():
+                pool.closeall()
+                logger.debug(f"Connection pool for {environment} closed")
+            self._pools.clear()
     
     def test_connection(self, environment: str) -> Dict[str, Any]:
         """Test database connection and return basic information."""
@@ -106,17 +282,222 @@ class DatabaseConnection:
     def get_available_environments(self) -> List[str]:
         """Get list of configured environments."""
         return list(self.environments.keys())
+
+    def max_parallel_cardinality_queries(self, environment: str) -> int:
+        """Upper bound for concurrent analysis queries in an environment.
+
+        Defaults to half the pool (capped at 8) so parallel analyzers
+        never drain every pooled connection; override per environment via
+        the max_parallel_cardinality_queries config key.
+        """
+        env_config = self.environments.get(environment, {})
+        pool_max = env_config.get('pool_max', 25)
+        return env_config.get('max_parallel_cardinality_queries',
+                              max(1, min(8, pool_max // 2)))
     
     def execute_query(self, environment: str, query: str, params: Optional[tuple] = None) -> List[Dict]:
         """Execute query and return results as list of dictionaries."""
+        return list(self.iter_query(environment, query, params))
+
+    @staticmethod
+    def _to_prepare_placeholders(query: str) -> str:
+        """Rewrite %s placeholders as $1..$n for a server-side PREPARE.
+
+        The prepared text bypasses psycopg2's interpolation, so escaped
+        `%%` literals are collapsed back to single `%` here.
+        """
+        parts = [part.replace('%%', '%') for part in query.split('%s')]
+        prepared = parts[0]
+        for index, part in enumerate(parts[1:], start=1):
+            prepared += f'${index}' + part
+        return prepared
+
+    def prepared_execute(self, environment: str, name: str, query: str,
+                         params: Optional[tuple] = None) -> List[Dict]:
+        """Execute a hot statement via server-side PREPARE / EXECUTE.
+
+        Repeated calls with the same statement name skip PostgreSQL
+        parse+plan; the statement is prepared lazily on each connection the
+        first time EXECUTE reports it as unknown.
+        """
+        if params:
+            execute_stmt = f"EXECUTE {name} ({', '.join(['%s'] * len(params))})"
+        else:
+            execute_stmt = f"EXECUTE {name}"
+
         try:
             with self.get_connection(environment) as conn:
                 cursor = conn.cursor(cursor_factory=RealDictCursor)
-                cursor.execute(query, params)
+                try:
+                    cursor.execute(execute_stmt, params)
+                except psycopg2.errors.InvalidSqlStatementName:
+                    # First use on this pooled connection: prepare, then retry
+                    conn.rollback()
+                    cursor = conn.cursor(cursor_factory=RealDictCursor)
+                    cursor.execute(f"PREPARE {name} AS {self._to_prepare_placeholders(query)}")
+                    # Commit so the prepared statement outlives the rollback
+                    # issued at pool checkin (and any later recovery rollback)
+                    conn.commit()
+                    cursor.execute(execute_stmt, params)
+
                 results = [dict(row) for row in cursor.fetchall()]
                 cursor.close()
                 return results
-                
+
+        except Exception as e:
+            logger.error(f"Prepared query {name} failed in {environment}: {e}")
+            raise
+
+    def copy_query_dataframe(self, environment: str, query: str) -> pd.DataFrame:
+        """Fetch an unparameterized query result as a DataFrame via COPY.
+
+        COPY ... TO STDOUT streams the rows as CSV bytes that pandas parses
+        in C, so wide catalog snapshots skip the per-row dict allocation of
+        `execute_query` entirely.
+        """
+        buffer = io.BytesIO()
+        try:
+            with self.get_connection(environment) as conn:
+                cursor = conn.cursor()
+                cursor.copy_expert(
+                    f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER true)",
+                    buffer
+                )
+                cursor.close()
+        except Exception as e:
+            logger.error(f"COPY query failed in {environment}: {e}")
+            raise
+
+        buffer.seek(0)
+        return pd.read_csv(buffer)
+
+    def execute_query_tuples(self, environment: str, query: str,
+                             params: Optional[tuple] = None) -> List[tuple]:
+        """Execute query on a plain cursor and return raw tuples.
+
+        Skips the per-row dict materialization of `execute_query`; use this
+        for large result sets where columns are accessed positionally.
+        """
+        try:
+            with self.get_connection(environment) as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                results = cursor.fetchall()
+                cursor.close()
+                return results
+
+        except Exception as e:
+            logger.error(f"Query execution failed in {environment}: {e}")
+            raise
+
+    def execute_query_namedtuples(self, environment: str, query: str,
+                                  params: Optional[tuple] = None) -> List[tuple]:
+        """Execute query and return rows as named tuples.
+
+        Named tuples keep per-row memory and access cost well below dicts
+        while still allowing `row.column` access; convert the few rows that
+        reach a report boundary with `row._asdict()`.
+        """
+        try:
+            with self.get_connection(environment) as conn:
+                cursor = conn.cursor(cursor_factory=NamedTupleCursor)
+                cursor.execute(query, params)
+                results = cursor.fetchall()
+                cursor.close()
+                return results
+
+        except Exception as e:
+            logger.error(f"Query execution failed in {environment}: {e}")
+            raise
+
+    def execute_query_scalar_column(self, environment: str, query: str,
+                                    params: Optional[tuple] = None) -> List[Any]:
+        """Execute query and return the first column as a flat list."""
+        return [row[0] for row in self.execute_query_tuples(environment, query, params)]
+
+    def bulk_insert(self, environment: str, query: str, rows: List[tuple],
+                    page_size: int = 1000) -> int:
+        """Insert many rows with one multi-VALUES statement per page.
+
+        `query` must contain a single `%s` VALUES placeholder, e.g.
+        `INSERT INTO da_column_stats (schema, "table", col, stat) VALUES %s`.
+        Network cost is amortized across `page_size` rows per round trip and
+        the whole batch commits as one transaction.
+        """
+        if not rows:
+            return 0
+
+        try:
+            with self.get_connection(environment) as conn:
+                cursor = conn.cursor()
+                execute_values(cursor, query, rows, page_size=page_size)
+                inserted = cursor.rowcount
+                cursor.close()
+                conn.commit()
+                return inserted
+
+        except Exception as e:
+            logger.error(f"Bulk insert failed in {environment}: {e}")
+            raise
+
+    def cached_query(self, environment: str, query: str,
+                     params: Optional[tuple] = None, ttl: float = 300.0) -> List[Dict]:
+        """Execute query with memoization for repeated catalog lookups.
+
+        Identical (environment, query, params) calls within `ttl` seconds are
+        served from an in-process cache, so layers that re-read the same
+        information_schema / pg_catalog metadata skip the round trip.
+        """
+        digest = hashlib.sha1(f"{query}|{params}".encode('utf-8')).hexdigest()
+        cache_key = (environment, digest)
+
+        with self._cache_lock:
+            cached = self._query_cache.get(cache_key)
+            if cached is not None:
+                cached_at, rows = cached
+                if time.time() - cached_at < ttl:
+                    logger.debug(f"Catalog cache hit for {environment}")
+                    return rows
+                del self._query_cache[cache_key]
+
+        rows = self.execute_query(environment, query, params)
+
+        with self._cache_lock:
+            self._query_cache[cache_key] = (time.time(), rows)
+
+        return rows
+
+    def clear_query_cache(self, environment: Optional[str] = None) -> None:
+        """Drop memoized catalog query results, optionally for one environment."""
+        with self._cache_lock:
+            if environment is None:
+                self._query_cache.clear()
+            else:
+                for cache_key in [key for key in self._query_cache
+                                  if key[0] == environment]:
+                    del self._query_cache[cache_key]
+
+    def iter_query(self, environment: str, query: str,
+                   params: Optional[tuple] = None, itersize: int = 10000):
+        """Execute query on a server-side cursor and yield rows lazily.
+
+        Rows stream from the server in `itersize` batches, so callers can
+        process large result sets without materializing them in memory.
+        """
+        try:
+            with self.get_connection(environment) as conn:
+                cursor = conn.cursor(
+                    name=f'archaeologist_{uuid4().hex}',
+                    cursor_factory=RealDictCursor
+                )
+                cursor.itersize = itersize
+                try:
+                    cursor.execute(query, params)
+                    for row in cursor:
+                        yield dict(row)
+                finally:
+                    cursor.close()
+
         except Exception as e:
             logger.error(f"Query execution failed in {environment}: {e}")
             raise
@@ -2,8 +2,11 @@
 Professional logging configuration for Data Archaeologist framework
 """
 
+import atexit
 import logging
 import logging.config
+import logging.handlers
+import queue
 from pathlib import Path
 
 # Professional logging configuration
@@ -57,27 +60,71 @@ LOGGING_CONFIG = {
     }
 }
 
+# Listener thread that drains queued records into the rotating file handlers
+_queue_listener = None
+
+
+def stop_queue_listener() -> None:
+    """Stop the background log listener and flush remaining records."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+def _detach_file_handlers_to_queue() -> None:
+    """Replace direct file handlers with a queue feeding a listener thread.
+
+    Worker threads then only enqueue records instead of taking the rotating
+    file handlers' I/O lock, so concurrent analyzers never block on logging.
+    """
+    global _queue_listener
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    file_handlers = []
+
+    for target in (logging.getLogger('data_archaeologist'), logging.getLogger()):
+        attached = [h for h in target.handlers
+                    if isinstance(h, logging.handlers.RotatingFileHandler)]
+        for handler in attached:
+            target.removeHandler(handler)
+            if handler not in file_handlers:
+                file_handlers.append(handler)
+        if attached:
+            target.addHandler(queue_handler)
+
+    if file_handlers:
+        _queue_listener = logging.handlers.QueueListener(
+            log_queue, *file_handlers, respect_handler_level=True
+        )
+        _queue_listener.start()
+        atexit.register(stop_queue_listener)
+
+
 def setup_professional_logging(config_dict: dict = None) -> None:
     """
     Setup professional logging configuration for the framework.
-    
+
     Args:
         config_dict: Optional custom logging configuration
     """
     if config_dict is None:
         config_dict = LOGGING_CONFIG
-    
+
     # Create logs directory if it doesn't exist
     logs_dir = Path('logs')
     logs_dir.mkdir(exist_ok=True)
-    
+
     # Update file paths to use logs directory
     for handler_name, handler_config in config_dict['handlers'].items():
         if 'filename' in handler_config:
             handler_config['filename'] = str(logs_dir / handler_config['filename'])
-    
+
+    stop_queue_listener()
     logging.config.dictConfig(config_dict)
-    
+    _detach_file_handlers_to_queue()
+
     # Log startup message
     logger = logging.getLogger('data_archaeologist')
     logger.info("Data Archaeologist framework logging initialized")
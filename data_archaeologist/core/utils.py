@@ -3,11 +3,29 @@ Core utilities and common functions for Data Archaeologist framework
 """
 
 import logging
+import time
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 import json
+
+import numpy as np
+
 from .logging_config import setup_professional_logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Shared orjson options for report output: numpy scalars/arrays serialize
+# in C instead of bouncing through default=str
+if orjson is not None:
+    _ORJSON_PRETTY = (orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                      | orjson.OPT_SERIALIZE_NUMPY)
+    _ORJSON_COMPACT = orjson.OPT_SERIALIZE_NUMPY
+else:
+    _ORJSON_PRETTY = _ORJSON_COMPACT = 0
+
 def setup_logging(log_file: str = 'data_archaeologist.log', 
                   level: int = logging.INFO) -> None:
     """Configure logging for the Data Archaeologist framework."""
@@ -24,58 +42,150 @@ def calculate_null_percentage(null_count: int, total_count: int) -> float:
         return 0.0
     return (null_count / total_count) * 100
 
+_BYTE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
 def format_bytes(bytes_value: int) -> str:
-    """Format bytes into human-readable format."""
+    """Format bytes into human-readable format.
+
+    The unit index comes straight from the bit length of the value, so the
+    helper stays branch-free on the hot report-emission path.
+    """
     if bytes_value == 0:
         return "0 B"
-    
-    units = ["B", "KB", "MB", "GB", "TB"]
-    unit_index = 0
-    size = float(bytes_value)
-    
-    while size >= 1024 and unit_index < len(units) - 1:
-        size /= 1024
-        unit_index += 1
-    
-    return f"{size:.2f} {units[unit_index]}"
+
+    unit_index = min((bytes_value.bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+    return f"{bytes_value / (1 << (unit_index * 10)):.2f} {_BYTE_UNITS[unit_index]}"
+
+def format_bytes_batch(byte_values: np.ndarray) -> List[str]:
+    """Format an int64 array of byte counts into human-readable strings.
+
+    Unit selection and scaling run as vectorized column passes; Python
+    only formats the final scalar per value. Matches format_bytes output
+    value for value.
+    """
+    if len(byte_values) == 0:
+        return []
+
+    values = np.asarray(byte_values, dtype=np.int64)
+    # frexp exponent == bit_length for positive ints, so this stays exact
+    # where a log2-and-truncate pass could round up at unit boundaries
+    _, exponents = np.frexp(np.maximum(values, 1).astype(np.float64))
+    unit_index = np.clip(
+        (exponents - 1) // 10, 0, len(_BYTE_UNITS) - 1
+    ).astype(np.int64)
+    scaled = values / (1 << (unit_index * 10))
+    return [
+        "0 B" if raw == 0 else f"{value:.2f} {_BYTE_UNITS[index]}"
+        for raw, value, index in zip(values.tolist(), scaled.tolist(), unit_index.tolist())
+    ]
 
 def export_to_json(data: Dict[str, Any], filename: str) -> None:
-    """Export data to JSON file with proper formatting."""
+    """Export data to JSON file with proper formatting.
+
+    Uses orjson's C encoder when available; falls back to stdlib json with
+    the same on-disk format.
+    """
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, default=str, ensure_ascii=False)
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(data, option=_ORJSON_PRETTY, default=str))
+        else:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, default=str, ensure_ascii=False)
     except Exception as e:
-        logging.error(f"Failed to export to {filename}: {e}")
+        logging.error("Failed to export to %s: %s", filename, e)
 
 def generate_timestamp() -> str:
     """Generate timestamp string for file naming."""
-    return datetime.now().strftime('%Y%m%d_%H%M%S')
+    # time.strftime on a struct_time skips the datetime object allocation
+    return time.strftime('%Y%m%d_%H%M%S', time.localtime())
+
+def _dumps_line(payload: Any) -> bytes:
+    """Serialize one NDJSON line as bytes, with or without orjson."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=_ORJSON_COMPACT, default=str) + b'\n'
+    return (json.dumps(payload, default=str, ensure_ascii=False) + '\n').encode('utf-8')
+
 
 class ArchaeologyReport:
-    """Base class for generating professional archaeology reports."""
-    
-    def __init__(self, environment: str):
+    """Base class for generating professional archaeology reports.
+
+    In streaming mode each section is written to disk as one NDJSON line the
+    moment it is added, so peak memory stays bounded by the largest section
+    and consumers can tail the file while discovery is still running.
+    """
+
+    def __init__(self, environment: str, streaming: bool = False,
+                 out_path: Optional[str] = None):
         self.environment = environment
         self.timestamp = datetime.now().isoformat()
+        # File-name timestamp is fixed at creation so chained exports of the
+        # same report reuse one formatted string
+        self._file_timestamp = generate_timestamp()
         self.data = {}
-    
+        self.streaming = streaming
+        self._fh = None
+        self._out_path = None
+
+        if streaming:
+            self._out_path = out_path or (
+                f"archaeology_stream_{environment}_{self._file_timestamp}.ndjson"
+            )
+            self._fh = open(self._out_path, 'wb')
+            self._fh.write(_dumps_line({
+                'metadata': {
+                    'environment': self.environment,
+                    'timestamp': self.timestamp
+                }
+            }))
+            self._fh.flush()
+
     def add_section(self, section_name: str, section_data: Any) -> None:
         """Add a section to the report."""
+        if self.streaming:
+            self._fh.write(_dumps_line({section_name: section_data}))
+            self._fh.flush()
+            return
         self.data[section_name] = section_data
-    
+
     def export(self, base_filename: str) -> str:
-        """Export report to JSON file."""
-        timestamp = generate_timestamp()
-        filename = f"{base_filename}_{self.environment}_{timestamp}.json"
-        
-        report = {
-            'metadata': {
-                'environment': self.environment,
-                'timestamp': self.timestamp,
-                'report_type': base_filename
-            },
-            'data': self.data
+        """Export report to JSON file.
+
+        In streaming mode the sections are already on disk; this just closes
+        the handle and returns the path. Otherwise sections are serialized
+        and written one at a time, so peak memory is bounded by the largest
+        section instead of the whole report.
+        """
+        if self.streaming:
+            if self._fh is not None and not self._fh.closed:
+                self._fh.close()
+            return self._out_path
+
+        filename = f"{base_filename}_{self.environment}_{self._file_timestamp}.json"
+
+        metadata = {
+            'environment': self.environment,
+            'timestamp': self.timestamp,
+            'report_type': base_filename
         }
-        
-        export_to_json(report, filename)
+
+        if orjson is None:
+            export_to_json({'metadata': metadata, 'data': self.data}, filename)
+            return filename
+
+        try:
+            option = _ORJSON_PRETTY
+            with open(filename, 'wb') as f:
+                f.write(b'{\n  "metadata": ')
+                f.write(orjson.dumps(metadata, option=option, default=str))
+                f.write(b',\n  "data": {')
+                for index, (section_name, section_data) in enumerate(self.data.items()):
+                    if index:
+                        f.write(b',')
+                    f.write(b'\n    ' + orjson.dumps(section_name) + b': ')
+                    f.write(orjson.dumps(section_data, option=option, default=str))
+                f.write(b'\n  }\n}\n')
+        except Exception as e:
+            logging.error("Failed to export report to %s: %s", filename, e)
+
         return filename
@@ -6,33 +6,317 @@ This module performs detailed column-level analysis including data types,
 memory consumption, NULL percentages, and initial data quality assessment.
 """
 
+import concurrent.futures
+import heapq
 import logging
+import re
 import sys
 import os
 from typing import Dict, List, Any, Optional
 
+import numpy as np
+import pandas as pd
+
 # Handle relative imports for both package usage and direct execution
 try:
     from ..core.database_connection import DatabaseConnection
-    from ..core.utils import ArchaeologyReport
+    from ..core.utils import ArchaeologyReport, calculate_null_percentage, setup_logging
 except ImportError:
-    # Direct execution - add parent directories to path
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    # Direct execution - register the package parent once, without
+    # duplicating the entry on re-import
+    _parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _parent not in sys.path:
+        sys.path.append(_parent)
     from core.database_connection import DatabaseConnection
-    from core.utils import ArchaeologyReport
+    from core.utils import ArchaeologyReport, calculate_null_percentage, setup_logging
 
 logger = logging.getLogger(__name__)
 
+# Classification lookups: O(1) set membership for data types, and a single
+# combined regex whose named groups cover all name-pattern checks in one scan
+_TS_TYPES = frozenset({'timestamp', 'timestamptz', 'date'})
+_ID_TYPES = frozenset({'integer', 'bigint'})
+_TEXT_TYPES = frozenset({'varchar', 'text', 'character'})
+_NAME_RE = re.compile(r'(?P<audit>created|updated)|(?P<fk>_id|id$)')
+
 
 class ColumnProfiler:
     """Column profiling and data quality analysis for physical layer discovery."""
-    
-    def __init__(self, db_connection: DatabaseConnection):
+
+    # Columns profiled per fused query; keeps very wide tables below
+    # statement-size and parser limits
+    COLUMN_CHUNK_SIZE = 32
+
+    # Above this row count, exact count(DISTINCT) is replaced with estimates
+    LARGE_TABLE_ROW_THRESHOLD = 1_000_000
+
+    def __init__(self, db_connection: DatabaseConnection, max_workers: int = 8):
         self.db_connection = db_connection
-    
-    def profile_table_columns(self, environment: str, 
-                             schema_name: str, table_name: str) -> Dict[str, Any]:
-        """Profile all columns in a specific table."""
+        self.max_workers = max_workers
+
+    def _load_distinct_estimates(self, environment: str, schema_name: str,
+                                 table_name: str, total_rows: int) -> Dict[str, int]:
+        """Load per-column distinct-count estimates from pg_stats.
+
+        ANALYZE already maintains n_distinct, so columns covered here skip
+        the expensive count(DISTINCT) aggregation entirely. Negative values
+        encode a fraction of the row count.
+        """
+        pg_stats_query = """
+        SELECT attname, n_distinct
+        FROM pg_stats
+        WHERE schemaname = %s AND tablename = %s
+        """
+
+        try:
+            rows = self.db_connection.cached_query(
+                environment, pg_stats_query, (schema_name, table_name)
+            )
+        except Exception as e:
+            logger.debug(f"pg_stats lookup failed for {schema_name}.{table_name}: {e}")
+            return {}
+
+        estimates = {}
+        for row in rows:
+            n_distinct = row['n_distinct']
+            if n_distinct is None or n_distinct == 0:
+                continue
+            if n_distinct >= 0:
+                estimates[row['attname']] = int(n_distinct)
+            else:
+                estimates[row['attname']] = int(round(-n_distinct * total_rows))
+
+        return estimates
+
+    def _bulk_load_pg_stats(self, environment: str,
+                            schema_names: List[str]) -> Dict[tuple, List[Dict]]:
+        """Load pg_stats rows for every table in the given schemas at once.
+
+        One catalog scan replaces a per-table pg_stats lookup; the result is
+        keyed by (schema, table) for use as a `stats_cache` in
+        `profile_table_columns`.
+        """
+        bulk_query = """
+        SELECT schemaname, tablename, attname, null_frac, n_distinct, avg_width
+        FROM pg_stats
+        WHERE schemaname = ANY(%s)
+        """
+
+        # Stream rows through a server-side cursor: wide deployments can have
+        # millions of pg_stats rows and only the grouped dict needs to live
+        # in memory
+        stats_cache: Dict[tuple, List[Dict]] = {}
+        try:
+            for row in self.db_connection.iter_query(
+                environment, bulk_query, (list(schema_names),)
+            ):
+                stats_cache.setdefault(
+                    (row['schemaname'], row['tablename']), []
+                ).append(row)
+        except Exception as e:
+            logger.debug(f"Bulk pg_stats load failed for {schema_names}: {e}")
+            return {}
+
+        logger.info(f"Bulk-loaded pg_stats for {len(stats_cache)} tables "
+                    f"across {len(schema_names)} schemas")
+        return stats_cache
+
+    def _load_constraints(self, environment: str, schema_name: str,
+                          table_name: str) -> Dict[str, Dict[str, bool]]:
+        """Load per-column uniqueness guarantees from declared constraints.
+
+        Only single-column PRIMARY KEY / UNIQUE constraints guarantee
+        column-level uniqueness; multi-column constraints are ignored.
+        """
+        constraints_query = """
+        SELECT tc.constraint_name, tc.constraint_type, kcu.column_name
+        FROM information_schema.table_constraints tc
+        JOIN information_schema.key_column_usage kcu
+          ON kcu.constraint_name = tc.constraint_name
+         AND kcu.table_schema = tc.table_schema
+         AND kcu.table_name = tc.table_name
+        WHERE tc.table_schema = %s AND tc.table_name = %s
+          AND tc.constraint_type IN ('PRIMARY KEY', 'UNIQUE')
+        """
+
+        try:
+            rows = self.db_connection.cached_query(
+                environment, constraints_query, (schema_name, table_name)
+            )
+        except Exception as e:
+            logger.debug(f"Constraint lookup failed for {schema_name}.{table_name}: {e}")
+            return {}
+
+        columns_by_constraint: Dict[str, List[Dict]] = {}
+        for row in rows:
+            columns_by_constraint.setdefault(row['constraint_name'], []).append(row)
+
+        constraints: Dict[str, Dict[str, bool]] = {}
+        for constraint_rows in columns_by_constraint.values():
+            if len(constraint_rows) != 1:
+                continue
+            row = constraint_rows[0]
+            flags = constraints.setdefault(
+                row['column_name'], {'unique': False, 'pk': False}
+            )
+            flags['unique'] = True
+            if row['constraint_type'] == 'PRIMARY KEY':
+                flags['pk'] = True
+
+        return constraints
+
+    @staticmethod
+    def _stats_from_pg_stats(col_stats: Dict, total_rows: int) -> Dict:
+        """Derive a column statistics dict from one pg_stats row."""
+        null_frac = col_stats['null_frac'] or 0.0
+        null_count = int(round(null_frac * total_rows))
+
+        n_distinct = col_stats['n_distinct'] or 0
+        if n_distinct >= 0:
+            distinct_count = int(n_distinct)
+        else:
+            distinct_count = int(round(-n_distinct * total_rows))
+        distinct_count = min(distinct_count, total_rows)
+
+        return {
+            'total_count': total_rows,
+            'non_null_count': total_rows - null_count,
+            'null_count': null_count,
+            'distinct_count': distinct_count,
+            'distinct_count_is_estimate': True
+        }
+
+    def _fetch_column_stats(self, environment: str, schema_name: str,
+                            table_name: str, columns_metadata: List[Dict],
+                            total_rows: int = 0,
+                            not_null_columns: Optional[set] = None) -> Dict[str, Dict]:
+        """Fetch NULL/distinct statistics for all columns in fused queries.
+
+        One aggregate query covers up to COLUMN_CHUNK_SIZE columns, so an
+        N-column table costs ceil(N/32) round trips and table scans instead
+        of one of each per column. Distinct counts come from pg_stats when
+        ANALYZE has populated them; for large tables without statistics a
+        1% TABLESAMPLE estimate replaces the exact full-table DISTINCT.
+        """
+        distinct_estimates = self._load_distinct_estimates(
+            environment, schema_name, table_name, total_rows
+        )
+        if not_null_columns is None:
+            not_null_columns = set()
+
+        # Columns where an exact DISTINCT would be too expensive and
+        # pg_stats has nothing: estimate from a block sample instead
+        sample_distinct = total_rows > self.LARGE_TABLE_ROW_THRESHOLD
+
+        stats_by_column: Dict[str, Dict] = {}
+
+        for start in range(0, len(columns_metadata), self.COLUMN_CHUNK_SIZE):
+            chunk = columns_metadata[start:start + self.COLUMN_CHUNK_SIZE]
+
+            select_parts = ['count(*) as total_count']
+            sampled_parts = []
+            for i, col in enumerate(chunk):
+                column_name = col['column_name']
+                known_not_null = column_name in not_null_columns
+                if not known_not_null:
+                    # NOT NULL columns skip their null-counting aggregates:
+                    # the constraint already guarantees the answer
+                    select_parts.append(f'count("{column_name}") as nn_{i}')
+                    select_parts.append(
+                        f'100.0 * (count(*) - count("{column_name}")) / nullif(count(*), 0) as np_{i}'
+                    )
+                if column_name in distinct_estimates:
+                    continue
+                if sample_distinct:
+                    sampled_parts.append(f'count(DISTINCT "{column_name}") as nd_{i}')
+                else:
+                    # Deterministic classification flags ride along for free
+                    # on the same scan
+                    select_parts.append(f'count(DISTINCT "{column_name}") as nd_{i}')
+                    if known_not_null:
+                        select_parts.append(
+                            f'(count(DISTINCT "{column_name}") = count(*) '
+                            f'AND count(*) > 0) as pk_{i}'
+                        )
+                    else:
+                        select_parts.append(
+                            f'(count(DISTINCT "{column_name}") = count(*) '
+                            f'AND count(*) - count("{column_name}") = 0 '
+                            f'AND count(*) > 0) as pk_{i}'
+                        )
+                    select_parts.append(
+                        f'(count(DISTINCT "{column_name}") = 1 AND count(*) > 1) as const_{i}'
+                    )
+
+            fused_query = f"""
+            SELECT {', '.join(select_parts)}
+            FROM "{schema_name}"."{table_name}"
+            """
+
+            result = self.db_connection.execute_query(environment, fused_query)
+            if not result:
+                continue
+            row = result[0]
+
+            sampled_row = {}
+            if sampled_parts:
+                sample_query = f"""
+                SELECT {', '.join(sampled_parts)}
+                FROM "{schema_name}"."{table_name}" TABLESAMPLE SYSTEM (1)
+                """
+                sample_result = self.db_connection.execute_query(environment, sample_query)
+                if sample_result:
+                    sampled_row = sample_result[0]
+
+            total_count = row['total_count']
+            for i, col in enumerate(chunk):
+                column_name = col['column_name']
+                non_null_count = row.get(f'nn_{i}', total_count)
+
+                if column_name in distinct_estimates:
+                    distinct_count = min(distinct_estimates[column_name], total_count)
+                    is_estimate = True
+                elif f'nd_{i}' in row:
+                    distinct_count = row[f'nd_{i}']
+                    is_estimate = False
+                else:
+                    # Coarse linear scale-up of the 1% block sample, capped
+                    # by the row count
+                    distinct_count = min((sampled_row.get(f'nd_{i}', 0) or 0) * 100,
+                                         total_count)
+                    is_estimate = True
+
+                column_stats = {
+                    'total_count': total_count,
+                    'non_null_count': non_null_count,
+                    'null_count': total_count - non_null_count,
+                    'distinct_count': distinct_count,
+                    'distinct_count_is_estimate': is_estimate
+                }
+                if column_name in not_null_columns:
+                    column_stats['null_pct'] = 0.0
+                else:
+                    null_pct = row.get(f'np_{i}')
+                    if null_pct is not None:
+                        column_stats['null_pct'] = float(null_pct)
+                if f'pk_{i}' in row:
+                    column_stats['is_pk_candidate'] = bool(row[f'pk_{i}'])
+                if f'const_{i}' in row:
+                    column_stats['is_constant'] = bool(row[f'const_{i}'])
+                stats_by_column[column_name] = column_stats
+
+        return stats_by_column
+
+    def profile_table_columns(self, environment: str,
+                             schema_name: str, table_name: str,
+                             stats_cache: Optional[Dict[tuple, List[Dict]]] = None) -> Dict[str, Any]:
+        """Profile all columns in a specific table.
+
+        A prefetched pg_stats cache (from `_bulk_load_pg_stats`) can be passed
+        in; columns it covers are profiled from catalog statistics without
+        touching the table, and only uncovered columns fall back to the live
+        fused scan.
+        """
         logger.info(f"Profiling columns for {schema_name}.{table_name} in {environment}")
         
         # Get column metadata
@@ -55,48 +339,108 @@ class ColumnProfiler:
         """
         
         try:
-            columns_metadata = self.db_connection.execute_query(
-                environment, metadata_query, (schema_name, table_name)
-            )
-            
-            # Get table row count for percentage calculations
-            count_query = f"""
-            SELECT count(*) as total_rows 
-            FROM "{schema_name}"."{table_name}"
-            """
-            
-            total_rows_result = self.db_connection.execute_query(environment, count_query)
-            total_rows = total_rows_result[0]['total_rows'] if total_rows_result else 0
-            
+            # All queries for this table share one session-bound connection,
+            # so a full profile costs a single pool checkout and implicit
+            # transaction instead of one per query
+            with self.db_connection.session(environment):
+                columns_metadata = self.db_connection.cached_query(
+                    environment, metadata_query, (schema_name, table_name)
+                )
+
+                # Planner estimate for the row count: O(1) catalog lookup
+                # instead of a full count(*) scan; the fused statistics query
+                # below produces the exact count as a by-product
+                count_query = """
+                SELECT greatest(c.reltuples::bigint, 0) as total_rows
+                FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE n.nspname = %s AND c.relname = %s
+                """
+
+                total_rows_result = self.db_connection.execute_query(
+                    environment, count_query, (schema_name, table_name)
+                )
+                total_rows = total_rows_result[0]['total_rows'] if total_rows_result else 0
+
+                # Columns covered by the prefetched pg_stats cache are
+                # profiled from catalog statistics; the rest go through the
+                # live scan
+                stats_by_column: Dict[str, Dict] = {}
+                cached_columns = {}
+                if stats_cache is not None:
+                    cached_columns = {
+                        row['attname']: row
+                        for row in stats_cache.get((schema_name, table_name), [])
+                    }
+                    for column_name, col_stats in cached_columns.items():
+                        stats_by_column[column_name] = self._stats_from_pg_stats(
+                            col_stats, total_rows
+                        )
+
+                # Declared constraints settle uniqueness and nullability
+                # without scanning: single-column PK/UNIQUE on a NOT NULL
+                # column needs no statistics query at all
+                constraints = self._load_constraints(environment, schema_name, table_name)
+                not_null_columns = {col['column_name'] for col in columns_metadata
+                                    if col['is_nullable'] == 'NO'}
+                constraint_columns = set()
+                for col in columns_metadata:
+                    column_name = col['column_name']
+                    flags = constraints.get(column_name)
+                    if flags is None or not flags['unique']:
+                        continue
+                    if column_name not in not_null_columns and not flags['pk']:
+                        continue
+                    constraint_columns.add(column_name)
+                    stats_by_column[column_name] = {
+                        'total_count': total_rows,
+                        'non_null_count': total_rows,
+                        'null_count': 0,
+                        'distinct_count': total_rows,
+                        'distinct_count_is_estimate': False,
+                        'null_pct': 0.0,
+                        'is_pk_candidate': total_rows > 0,
+                        'is_constant': False
+                    }
+
+                uncovered = [col for col in columns_metadata
+                             if col['column_name'] not in cached_columns
+                             and col['column_name'] not in constraint_columns]
+
+                if uncovered:
+                    # One fused statistics query per column chunk instead of
+                    # one per column
+                    live_stats = self._fetch_column_stats(
+                        environment, schema_name, table_name, uncovered, total_rows,
+                        not_null_columns=not_null_columns
+                    )
+
+                    # The fused query counted the table exactly; replace the
+                    # planner estimate with it so percentages use the true
+                    # denominator
+                    for column_stats in live_stats.values():
+                        total_rows = column_stats['total_count']
+                        break
+                    stats_by_column.update(live_stats)
+
             # Profile each column
             column_profiles = []
-            
+
             for col in columns_metadata:
                 column_name = col['column_name']
-                
-                # Get NULL count and basic statistics
-                profile_query = f"""
-                SELECT 
-                    count(*) as total_count,
-                    count("{column_name}") as non_null_count,
-                    count(*) - count("{column_name}") as null_count,
-                    count(DISTINCT "{column_name}") as distinct_count
-                FROM "{schema_name}"."{table_name}"
-                """
-                
-                profile_result = self.db_connection.execute_query(environment, profile_query)
-                profile_stats = profile_result[0] if profile_result else {}
-                
-                # Calculate percentages
-                null_percentage = calculate_null_percentage(
-                    profile_stats.get('null_count', 0), 
+                profile_stats = stats_by_column.get(column_name, {})
+
+                # Calculate percentages, clamped in case a stale planner
+                # estimate ever serves as the denominator
+                null_percentage = min(100.0, max(0.0, calculate_null_percentage(
+                    profile_stats.get('null_count', 0),
                     total_rows
-                )
-                
-                distinct_percentage = (
-                    (profile_stats.get('distinct_count', 0) / total_rows * 100) 
+                )))
+
+                distinct_percentage = min(100.0, max(0.0, (
+                    (profile_stats.get('distinct_count', 0) / total_rows * 100)
                     if total_rows > 0 else 0
-                )
+                )))
                 
                 # Determine column characteristics
                 column_characteristics = self._analyze_column_characteristics(
@@ -140,32 +484,47 @@ class ColumnProfiler:
         
         null_count = stats.get('null_count', 0)
         distinct_count = stats.get('distinct_count', 0)
-        null_percentage = (null_count / total_rows * 100) if total_rows > 0 else 0
+        # null_pct is computed server-side in the fused query; fall back to
+        # Python arithmetic when only partial statistics are available
+        null_percentage = stats.get('null_pct')
+        if null_percentage is None:
+            null_percentage = (null_count / total_rows * 100) if total_rows > 0 else 0
         distinct_percentage = (distinct_count / total_rows * 100) if total_rows > 0 else 0
-        
-        # Analyze likely purpose based on patterns
+
+        # Analyze likely purpose based on patterns; one regex pass collects
+        # every matched name group
         column_name = metadata['column_name'].lower()
         data_type = metadata['data_type'].lower()
-        
-        # Primary key indicators
-        if distinct_count == total_rows and null_count == 0:
+        name_groups = {m.lastgroup for m in _NAME_RE.finditer(column_name)}
+
+        # Primary key indicators: prefer the SQL-evaluated flag; estimated
+        # distinct counts get a ratio check instead of exact equality
+        is_pk_candidate = stats.get('is_pk_candidate')
+        if is_pk_candidate is None:
+            if stats.get('distinct_count_is_estimate', False):
+                looks_unique = total_rows > 0 and (distinct_count / total_rows) >= 0.99
+            else:
+                looks_unique = distinct_count == total_rows
+            is_pk_candidate = looks_unique and null_count == 0 and total_rows > 0
+
+        if is_pk_candidate:
             characteristics['likely_purpose'] = 'primary_key_candidate'
             characteristics['business_insights'].append('Unique, non-null - potential primary key')
-        
+
         # Foreign key indicators
-        elif ('_id' in column_name or column_name.endswith('id')) and data_type in ['integer', 'bigint']:
+        elif 'fk' in name_groups and data_type in _ID_TYPES:
             characteristics['likely_purpose'] = 'foreign_key_candidate'
             characteristics['business_insights'].append('ID pattern suggests foreign key relationship')
-        
+
         # Timestamp columns
-        elif data_type in ['timestamp', 'timestamptz', 'date']:
-            if 'created' in column_name or 'updated' in column_name:
+        elif data_type in _TS_TYPES:
+            if 'audit' in name_groups:
                 characteristics['likely_purpose'] = 'audit_timestamp'
             else:
                 characteristics['likely_purpose'] = 'business_timestamp'
-        
+
         # Status/category columns
-        elif distinct_count < 20 and data_type in ['varchar', 'text', 'character']:
+        elif distinct_count < 20 and data_type in _TEXT_TYPES:
             characteristics['likely_purpose'] = 'categorical_data'
             characteristics['business_insights'].append(f'Low cardinality ({distinct_count} values) suggests categories/status')
         
@@ -176,7 +535,10 @@ class ColumnProfiler:
         if null_percentage > 90:
             characteristics['data_quality_issues'].append('Extremely high NULL rate - unused field or data quality problem')
         
-        if distinct_count == 1 and total_rows > 1:
+        is_constant = stats.get('is_constant')
+        if is_constant is None:
+            is_constant = distinct_count == 1 and total_rows > 1
+        if is_constant:
             characteristics['data_quality_issues'].append('Single value across all rows - potential constant or default')
         
         # Optimization notes
@@ -188,25 +550,88 @@ class ColumnProfiler:
         
         return characteristics
     
-    def analyze_schema_column_patterns(self, environment: str, 
-                                     schema_name: str, limit: int = 20) -> Dict[str, Any]:
-        """Analyze column patterns across all tables in a schema."""
+    def analyze_schemas_batch(self, environment: str, schema_names: List[str],
+                              top_n: int = 20) -> Dict[str, Any]:
+        """Analyze column patterns for several schemas with one table-list query.
+
+        Fetches the top-N tables of every requested schema in a single
+        windowed catalog query instead of one round trip per schema.
+        """
+        logger.info(f"Batch-analyzing column patterns for {len(schema_names)} schemas in {environment}")
+
+        tables_query = """
+        SELECT schemaname, tablename, estimated_rows
+        FROM (
+            SELECT
+                schemaname,
+                tablename,
+                n_live_tup as estimated_rows,
+                ROW_NUMBER() OVER (
+                    PARTITION BY schemaname
+                    ORDER BY n_live_tup DESC NULLS LAST
+                ) as size_rank
+            FROM pg_stat_user_tables
+            WHERE schemaname = ANY(%s)
+        ) ranked
+        WHERE size_rank <= %s
+        """
+
+        rows = self.db_connection.execute_query(
+            environment, tables_query, (list(schema_names), top_n)
+        )
+
+        tables_by_schema: Dict[str, List[Dict]] = {name: [] for name in schema_names}
+        for row in rows:
+            tables_by_schema[row['schemaname']].append(row)
+
+        # One pg_stats scan for the whole batch; per-table profiling then
+        # reads the cache instead of re-querying the catalog
+        stats_cache = self._bulk_load_pg_stats(environment, list(schema_names))
+
+        batch_results = {}
+        for schema_name in schema_names:
+            try:
+                batch_results[schema_name] = self.analyze_schema_column_patterns(
+                    environment, schema_name, top_n,
+                    tables=tables_by_schema[schema_name],
+                    stats_cache=stats_cache
+                )
+            except Exception as e:
+                logger.warning(f"Column profiling failed for schema {schema_name}: {e}")
+                batch_results[schema_name] = {'error': str(e)}
+
+        return batch_results
+
+    def analyze_schema_column_patterns(self, environment: str,
+                                     schema_name: str, limit: int = 20,
+                                     tables: Optional[List[Dict]] = None,
+                                     stats_cache: Optional[Dict[tuple, List[Dict]]] = None) -> Dict[str, Any]:
+        """Analyze column patterns across all tables in a schema.
+
+        A pre-fetched table list and pg_stats cache (from
+        `analyze_schemas_batch`) can be passed in to skip the per-schema and
+        per-table catalog round trips.
+        """
         logger.info(f"Analyzing column patterns for schema {schema_name} in {environment}")
-        
+
         # Get top tables by size for analysis
         tables_query = """
-        SELECT 
+        SELECT
             tablename,
             n_live_tup as estimated_rows
-        FROM pg_stat_user_tables 
+        FROM pg_stat_user_tables
         WHERE schemaname = %s
         ORDER BY n_live_tup DESC NULLS LAST
         LIMIT %s
         """
-        
+
         try:
-            tables = self.db_connection.execute_query(environment, tables_query, (schema_name, limit))
-            
+            if tables is None:
+                tables = self.db_connection.prepared_execute(
+                    environment, 'archaeol_schema_top_tables',
+                    tables_query, (schema_name, limit)
+                )
+
             schema_analysis = {
                 'environment': environment,
                 'schema_name': schema_name,
@@ -221,31 +646,64 @@ class ColumnProfiler:
                 }
             }
             
-            for table in tables:
-                table_name = table['tablename']
-                
-                try:
-                    table_profile = self.profile_table_columns(environment, schema_name, table_name)
-                    schema_analysis['table_profiles'].append(table_profile)
-                    
-                    # Update schema summary
-                    schema_analysis['schema_summary']['total_columns'] += table_profile['total_columns']
-                    
-                    for col in table_profile['column_profiles']:
-                        if col['null_percentage'] > 50:
-                            schema_analysis['schema_summary']['high_null_columns'] += 1
-                        
-                        if col['characteristics']['likely_purpose'] == 'primary_key_candidate':
-                            schema_analysis['schema_summary']['primary_key_candidates'] += 1
-                        elif col['characteristics']['likely_purpose'] == 'foreign_key_candidate':
-                            schema_analysis['schema_summary']['foreign_key_candidates'] += 1
-                        
-                        if col['characteristics']['data_quality_issues']:
-                            schema_analysis['schema_summary']['data_quality_issues'] += 1
-                    
-                except Exception as e:
-                    logger.warning(f"Skipping table {table_name} due to error: {e}")
-                    continue
+            # Summary counters accumulate in one int64 vector, updated with
+            # a boolean-mask pass per table profile as it completes; no
+            # whole-schema record list is ever materialized
+            counters = np.zeros(5, dtype=np.int64)
+
+            def roll_up(table_profile: Dict) -> None:
+                nonlocal counters
+                records = [
+                    (col['null_percentage'],
+                     col['characteristics']['likely_purpose'],
+                     bool(col['characteristics']['data_quality_issues']))
+                    for col in table_profile['column_profiles']
+                ]
+                if not records:
+                    return
+                columns_df = pd.DataFrame.from_records(
+                    records,
+                    columns=['null_percentage', 'likely_purpose', 'has_quality_issues']
+                )
+                counters += np.array([
+                    len(columns_df),
+                    (columns_df['null_percentage'] > 50).sum(),
+                    (columns_df['likely_purpose'] == 'primary_key_candidate').sum(),
+                    (columns_df['likely_purpose'] == 'foreign_key_candidate').sum(),
+                    columns_df['has_quality_issues'].sum()
+                ], dtype=np.int64)
+
+            # Profile tables concurrently; each worker leases its own pooled
+            # connection, so the wall-clock cost is bounded by the slowest
+            # table instead of the sum
+            if tables:
+                with concurrent.futures.ThreadPoolExecutor(
+                    max_workers=min(self.max_workers, len(tables))
+                ) as executor:
+                    future_map = {
+                        executor.submit(
+                            self.profile_table_columns,
+                            environment, schema_name, table['tablename'],
+                            stats_cache
+                        ): table['tablename']
+                        for table in tables
+                    }
+
+                    for future in concurrent.futures.as_completed(future_map):
+                        table_name = future_map[future]
+                        try:
+                            table_profile = future.result()
+                        except Exception as e:
+                            logger.warning(f"Skipping table {table_name} due to error: {e}")
+                            continue
+                        schema_analysis['table_profiles'].append(table_profile)
+                        roll_up(table_profile)
+
+            schema_analysis['schema_summary'].update(dict(zip(
+                ['total_columns', 'high_null_columns', 'primary_key_candidates',
+                 'foreign_key_candidates', 'data_quality_issues'],
+                counters.tolist()
+            )))
             
             logger.info(f"Schema analysis complete for {schema_name}: "
                        f"{schema_analysis['schema_summary']['total_columns']} columns analyzed")
@@ -256,36 +714,59 @@ class ColumnProfiler:
             logger.error(f"Schema column pattern analysis failed for {schema_name}: {e}")
             raise
     
-    def generate_column_profile_report(self, environment: str, 
-                                     target_schema: Optional[str] = None) -> str:
+    def _select_top_schemas(self, environment: str, top_k: int = 5,
+                            metric: str = 'table_count') -> List[str]:
+        """Pick the top-K user schemas by size instead of name order.
+
+        Supported metrics: 'table_count' (objects per schema) and
+        'estimated_rows' (summed pg_stat live-tuple estimates).
+        """
+        if metric not in ('table_count', 'estimated_rows'):
+            raise ValueError(f"Unknown schema selection metric: {metric}")
+
+        schemas_query = """
+        SELECT
+            t.table_schema as schema_name,
+            count(*) as table_count,
+            coalesce(sum(s.n_live_tup), 0) as estimated_rows
+        FROM information_schema.tables t
+        LEFT JOIN pg_stat_user_tables s
+          ON s.schemaname = t.table_schema AND s.relname = t.table_name
+        WHERE t.table_schema NOT IN ('information_schema', 'pg_catalog')
+        AND t.table_schema NOT LIKE 'pg_%'
+        GROUP BY t.table_schema
+        """
+
+        schemas = self.db_connection.cached_query(environment, schemas_query)
+        top = heapq.nlargest(top_k, schemas, key=lambda s: s[metric])
+        return [s['schema_name'] for s in top]
+
+    def generate_column_profile_report(self, environment: str,
+                                     target_schema: Optional[str] = None,
+                                     top_k: int = 5,
+                                     selection_metric: str = 'table_count') -> str:
         """Generate comprehensive column profiling report."""
         logger.info(f"Generating column profile report for {environment}")
-        
+
         report = ArchaeologyReport(environment)
-        
+
         try:
             if target_schema:
                 # Analyze specific schema
                 schema_analysis = self.analyze_schema_column_patterns(environment, target_schema)
                 report.add_section('schema_column_analysis', schema_analysis)
             else:
-                # Analyze all user schemas
-                schemas_query = """
-                SELECT schema_name 
-                FROM information_schema.schemata 
-                WHERE schema_name NOT IN ('information_schema', 'pg_catalog')
-                AND schema_name NOT LIKE 'pg_%'
-                ORDER BY schema_name
-                """
-                
-                schemas = self.db_connection.execute_query(environment, schemas_query)
-                
+                # Analyze the largest user schemas so the profiling budget
+                # goes where the data is, not to the first K names
+                schema_names = self._select_top_schemas(
+                    environment, top_k, selection_metric
+                )
+
                 all_schema_analyses = []
-                for schema in schemas[:5]:  # Limit to top 5 schemas to avoid overwhelming
-                    schema_name = schema['schema_name']
+                for schema_name in schema_names:
                     schema_analysis = self.analyze_schema_column_patterns(environment, schema_name, 10)
                     all_schema_analyses.append(schema_analysis)
-                
+
                 report.add_section('all_schemas_column_analysis', all_schema_analyses)
             
             # Export report
@@ -301,17 +782,7 @@ class ColumnProfiler:
 
 def main():
     """Command-line interface for column profiling analysis."""
-    import sys
-    
-    # Handle relative imports for both package usage and direct execution
-    try:
-        from ..core.utils import setup_logging
-    except ImportError:
-        # Direct execution - add parent directories to path
-        import os
-        sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        from core.utils import setup_logging
-    
+    # Module import already resolved setup_logging for both execution modes
     setup_logging()
     
     if len(sys.argv) < 2:
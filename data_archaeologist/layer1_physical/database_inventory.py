@@ -9,17 +9,22 @@ discovering all databases, schemas, and their basic properties.
 import logging
 import sys
 import os
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+import pandas as pd
 
 # Handle relative imports for both package usage and direct execution
 try:
     from ..core.database_connection import DatabaseConnection
-    from ..core.utils import ArchaeologyReport
+    from ..core.utils import ArchaeologyReport, setup_logging
 except ImportError:
-    # Direct execution - add parent directories to path
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    # Direct execution - register the package parent once, without
+    # duplicating the entry on re-import
+    _parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _parent not in sys.path:
+        sys.path.append(_parent)
     from core.database_connection import DatabaseConnection
-    from core.utils import ArchaeologyReport
+    from core.utils import ArchaeologyReport, setup_logging
 
 logger = logging.getLogger(__name__)
 
@@ -30,76 +35,159 @@ class DatabaseInventory:
     def __init__(self, db_connection: DatabaseConnection):
         self.db_connection = db_connection
     
-    def discover_databases(self, environment: str) -> Dict[str, Any]:
-        """Discover all accessible databases in the environment."""
-        logger.info(f"Starting database discovery for {environment}")
-        
-        query = """
-        SELECT 
+    # Single-scan catalog bundle shared by the Layer-1 analyzers. One CTE
+    # query replaces the separate table-count, sizing and activity scans.
+    LAYER1_BUNDLE_QUERY = """
+    WITH tables AS (
+        SELECT
+            table_schema AS schemaname,
+            table_name AS tablename,
+            table_type
+        FROM information_schema.tables
+        WHERE table_schema NOT IN ('information_schema', 'pg_catalog')
+        AND table_schema NOT LIKE 'pg_%'
+    ),
+    sizes AS (
+        -- Sizing by pg_class oid, not a text-concatenated regclass cast,
+        -- so mixed-case and reserved-word table names don't error out
+        SELECT
+            n.nspname AS schemaname,
+            c.relname AS tablename,
+            pg_total_relation_size(c.oid) AS total_size_bytes,
+            pg_relation_size(c.oid) AS table_size_bytes
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relkind IN ('r', 'p')
+        AND n.nspname NOT IN ('information_schema', 'pg_catalog')
+        AND n.nspname NOT LIKE 'pg_%'
+    ),
+    stats AS (
+        SELECT
+            schemaname, tablename,
+            n_live_tup, n_dead_tup,
+            n_tup_ins, n_tup_upd, n_tup_del,
+            seq_scan, seq_tup_read, idx_scan, idx_tup_fetch,
+            last_vacuum, last_autovacuum, last_analyze, last_autoanalyze
+        FROM pg_stat_user_tables
+    )
+    SELECT
+        t.schemaname, t.tablename, t.table_type,
+        z.total_size_bytes, z.table_size_bytes,
+        s.n_live_tup, s.n_dead_tup, s.n_tup_ins, s.n_tup_upd, s.n_tup_del,
+        s.seq_scan, s.seq_tup_read, s.idx_scan, s.idx_tup_fetch,
+        s.last_vacuum, s.last_autovacuum, s.last_analyze, s.last_autoanalyze
+    FROM tables t
+    LEFT JOIN sizes z ON z.schemaname = t.schemaname AND z.tablename = t.tablename
+    LEFT JOIN stats s ON s.schemaname = t.schemaname AND s.tablename = t.tablename
+    """
+
+    def fetch_layer1_bundle(self, environment: str) -> pd.DataFrame:
+        """Fetch the fused Layer-1 catalog dataset as a single round trip.
+
+        Returns one row per table object with its type, storage sizes and
+        pg_stat activity counters, so the inventory and sizing analyzers can
+        slice the frame instead of issuing independent catalog scans. The
+        rows arrive via COPY and land straight in the frame without
+        intermediate per-row dicts.
+        """
+        logger.info(f"Fetching fused Layer-1 catalog bundle for {environment}")
+
+        bundle = self.db_connection.copy_query_dataframe(
+            environment, self.LAYER1_BUNDLE_QUERY
+        )
+        logger.info(f"Layer-1 bundle contains {len(bundle)} table objects")
+
+        return bundle
+
+    # System schemas to identify separately
+    SYSTEM_SCHEMAS = [
+        'information_schema', 'pg_catalog', 'pg_toast',
+        'pg_temp_1', 'pg_toast_temp_1'
+    ]
+
+    # Databases, schemas and table counts fetched in one round trip; Postgres
+    # aggregates each section into a JSON array server-side
+    INVENTORY_BUNDLE_QUERY = """
+    WITH dbs AS (
+        SELECT
             datname as database_name,
             pg_size_pretty(pg_database_size(datname)) as database_size,
             pg_database_size(datname) as database_size_bytes,
             datcollate as collation,
             datctype as character_type,
             pg_encoding_to_char(encoding) as encoding
-        FROM pg_database 
+        FROM pg_database
         WHERE datistemplate = false
-        ORDER BY pg_database_size(datname) DESC
-        """
-        
+    ),
+    schs AS (
+        SELECT
+            schema_name,
+            schema_owner,
+            CASE
+                WHEN schema_name = ANY(%s) THEN 'system'
+                WHEN schema_name LIKE 'pg_%%' THEN 'system'
+                ELSE 'user'
+            END as schema_type
+        FROM information_schema.schemata
+    ),
+    tbls AS (
+        SELECT
+            table_schema,
+            count(*) as table_count,
+            count(CASE WHEN table_type = 'BASE TABLE' THEN 1 END) as base_tables,
+            count(CASE WHEN table_type = 'VIEW' THEN 1 END) as views
+        FROM information_schema.tables
+        WHERE table_schema NOT IN ('information_schema', 'pg_catalog')
+        AND table_schema NOT LIKE 'pg_%%'
+        GROUP BY table_schema
+    )
+    SELECT json_build_object(
+        'databases', (SELECT json_agg(d ORDER BY d.database_size_bytes DESC) FROM dbs d),
+        'schemas', (SELECT json_agg(s ORDER BY (s.schema_type = 'system'), s.schema_name) FROM schs s),
+        'tables', (SELECT json_agg(t ORDER BY t.table_count DESC) FROM tbls t)
+    ) as inventory
+    """
+
+    def _fetch_inventory_bundle(self, environment: str) -> Dict[str, List[Dict]]:
+        """Fetch databases, schemas and table counts as one memoized query."""
+        rows = self.db_connection.cached_query(
+            environment, self.INVENTORY_BUNDLE_QUERY, (self.SYSTEM_SCHEMAS,)
+        )
+        inventory = rows[0]['inventory'] if rows else {}
+        return {
+            'databases': inventory.get('databases') or [],
+            'schemas': inventory.get('schemas') or [],
+            'tables': inventory.get('tables') or []
+        }
+
+    def discover_databases(self, environment: str) -> Dict[str, Any]:
+        """Discover all accessible databases in the environment."""
+        logger.info(f"Starting database discovery for {environment}")
+
         try:
-            databases = self.db_connection.execute_query(environment, query)
+            databases = self._fetch_inventory_bundle(environment)['databases']
             logger.info(f"Discovered {len(databases)} databases in {environment}")
-            
+
             return {
                 'environment': environment,
                 'total_databases': len(databases),
                 'databases': databases
             }
-            
+
         except Exception as e:
             logger.error(f"Database discovery failed for {environment}: {e}")
             raise
-    
+
     def discover_schemas(self, environment: str) -> Dict[str, Any]:
         """Discover all schemas in the current database."""
         logger.info(f"Starting schema discovery for {environment}")
-        
-        # System schemas to identify separately
-        system_schemas = [
-            'information_schema', 'pg_catalog', 'pg_toast',
-            'pg_temp_1', 'pg_toast_temp_1'
-        ]
-        
-        query = """
-        SELECT 
-            schema_name,
-            schema_owner,
-            CASE 
-                WHEN schema_name = ANY(%s) THEN 'system'
-                WHEN schema_name LIKE 'pg_%%' THEN 'system'
-                ELSE 'user'
-            END as schema_type
-        FROM information_schema.schemata
-        ORDER BY 
-            CASE 
-                WHEN schema_name = ANY(%s) THEN 2
-                WHEN schema_name LIKE 'pg_%%' THEN 2
-                ELSE 1
-            END,
-            schema_name
-        """
-        
+
         try:
-            schemas = self.db_connection.execute_query(
-                environment, 
-                query, 
-                (system_schemas, system_schemas)
-            )
-            
+            schemas = self._fetch_inventory_bundle(environment)['schemas']
+
             # Categorize schemas
             user_schemas = [s for s in schemas if s['schema_type'] == 'user']
-            system_schemas_found = [s for s in schemas 
+            system_schemas_found = [s for s in schemas
                                   if s['schema_type'] == 'system']
             
             logger.info(f"Discovered {len(user_schemas)} user schemas and "
@@ -120,26 +208,30 @@ class DatabaseInventory:
             logger.error(f"Schema discovery failed for {environment}: {e}")
             raise
     
-    def get_schema_table_counts(self, environment: str) -> Dict[str, Any]:
-        """Get table counts per schema for initial sizing analysis."""
-        logger.info(f"Analyzing schema table distribution for {environment}")
-        
-        query = """
-        SELECT 
-            table_schema,
-            count(*) as table_count,
-            count(CASE WHEN table_type = 'BASE TABLE' THEN 1 END) as base_tables,
-            count(CASE WHEN table_type = 'VIEW' THEN 1 END) as views
-        FROM information_schema.tables
-        WHERE table_schema NOT IN ('information_schema', 'pg_catalog')
-        AND table_schema NOT LIKE 'pg_%'
-        GROUP BY table_schema
-        ORDER BY table_count DESC
+    def get_schema_table_counts(self, environment: str,
+                                bundle: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """Get table counts per schema for initial sizing analysis.
+
+        When a pre-fetched Layer-1 bundle is supplied the counts are derived
+        from it instead of a separate information_schema scan.
         """
-        
+        logger.info(f"Analyzing schema table distribution for {environment}")
+
         try:
-            schema_stats = self.db_connection.execute_query(environment, query)
-            
+            if bundle is not None and not bundle.empty:
+                schema_stats = [
+                    {
+                        'table_schema': schema,
+                        'table_count': int(len(group)),
+                        'base_tables': int((group['table_type'] == 'BASE TABLE').sum()),
+                        'views': int((group['table_type'] == 'VIEW').sum())
+                    }
+                    for schema, group in bundle.groupby('schemaname')
+                ]
+                schema_stats.sort(key=lambda s: s['table_count'], reverse=True)
+            else:
+                schema_stats = self._fetch_inventory_bundle(environment)['tables']
+
             total_tables = sum(s['table_count'] for s in schema_stats)
             total_base_tables = sum(s['base_tables'] for s in schema_stats)
             total_views = sum(s['views'] for s in schema_stats)
@@ -192,17 +284,7 @@ class DatabaseInventory:
 
 def main():
     """Command-line interface for database inventory discovery."""
-    import sys
-    
-    # Handle relative imports for both package usage and direct execution
-    try:
-        from ..core.utils import setup_logging
-    except ImportError:
-        # Direct execution - add parent directories to path
-        import os
-        sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        from core.utils import setup_logging
-    
+    # Module import already resolved setup_logging for both execution modes
     setup_logging()
     
     if len(sys.argv) < 2:
@@ -6,83 +6,285 @@ This module identifies the largest tables by row count and storage size,
 providing insights into fact tables vs dimension tables and database gravity center.
 """
 
+import concurrent.futures
 import logging
 import sys
 import os
+import threading
+import time
 from typing import Dict, List, Any, Optional
 
+import numpy as np
+import pandas as pd
+
 # Handle relative imports for both package usage and direct execution
 try:
     from ..core.database_connection import DatabaseConnection
-    from ..core.utils import ArchaeologyReport
+    from ..core.utils import (ArchaeologyReport, format_bytes,
+                              format_bytes_batch, setup_logging)
+    from .database_inventory import DatabaseInventory
 except ImportError:
-    # Direct execution - add parent directories to path
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    # Direct execution - register the package parent once, without
+    # duplicating the entry on re-import
+    _parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _parent not in sys.path:
+        sys.path.append(_parent)
     from core.database_connection import DatabaseConnection
-    from core.utils import ArchaeologyReport
+    from core.utils import (ArchaeologyReport, format_bytes,
+                            format_bytes_batch, setup_logging)
+    from layer1_physical.database_inventory import DatabaseInventory
 
 logger = logging.getLogger(__name__)
 
+# Size-category thresholds as bit-shifted byte counts
+_100MB = 100 << 20
+_10MB = 10 << 20
+
+
+def _int_column(rows: List[Dict], key: str) -> np.ndarray:
+    """Extract one dict key across all rows as an int64 column array."""
+    return np.fromiter(
+        ((row.get(key) or 0) for row in rows), dtype=np.int64, count=len(rows)
+    )
+
+
+def _partition(rows: List[Dict], masks: Dict[str, np.ndarray],
+               caps: Optional[Dict[str, int]] = None) -> tuple:
+    """Split rows into named buckets with one pass over precomputed masks.
+
+    With `caps`, each bucket keeps only its first N matches — the rowsets
+    arrive pre-sorted on the ranking metric, so that is the top N — while
+    the returned counts stay exact for the full input.
+    """
+    buckets: Dict[str, List[Dict]] = {name: [] for name in masks}
+    counts: Dict[str, int] = {name: 0 for name in masks}
+    for index, row in enumerate(rows):
+        for name, mask in masks.items():
+            if mask[index]:
+                counts[name] += 1
+                if caps is None or len(buckets[name]) < caps[name]:
+                    buckets[name].append(row)
+    return buckets, counts
+
 
 class TableSizingAnalyzer:
     """Table sizing and granularity analysis for physical layer discovery."""
-    
+
+    # Cached analysis results live this long, and are additionally discarded
+    # once the database has committed this many transactions since the
+    # result was computed
+    ANALYSIS_CACHE_TTL = 300.0
+    XACT_DRIFT_THRESHOLD = 1000
+
+    # Size-category boundaries; class attributes so environment-specific
+    # subclasses can retune the buckets
+    LARGE_TABLE_THRESHOLD_BYTES = _100MB
+    SMALL_TABLE_THRESHOLD_BYTES = _10MB
+
     def __init__(self, db_connection: DatabaseConnection):
         self.db_connection = db_connection
+        self._analysis_cache: Dict[tuple, tuple] = {}
+        self._analysis_cache_lock = threading.Lock()
+
+    def _current_xact_commit(self, environment: str) -> Optional[int]:
+        """Read the commit counter used to detect database churn."""
+        try:
+            values = self.db_connection.execute_query_scalar_column(
+                environment,
+                "SELECT xact_commit FROM pg_stat_database "
+                "WHERE datname = current_database()"
+            )
+            return values[0] if values else None
+        except Exception as e:
+            logger.debug(f"xact_commit probe failed for {environment}: {e}")
+            return None
+
+    def _get_cached_analysis(self, environment: str, cache_key: tuple) -> Optional[Dict]:
+        """Return a cached analysis if it is fresh and the DB barely moved."""
+        with self._analysis_cache_lock:
+            entry = self._analysis_cache.get((environment,) + cache_key)
+        if entry is None:
+            return None
+
+        cached_at, cached_xact, result = entry
+        if time.time() - cached_at >= self.ANALYSIS_CACHE_TTL:
+            return None
+
+        current_xact = self._current_xact_commit(environment)
+        if (cached_xact is None or current_xact is None
+                or current_xact - cached_xact > self.XACT_DRIFT_THRESHOLD):
+            return None
+
+        logger.debug(f"Analysis cache hit for {environment} {cache_key}")
+        return result
+
+    def _store_cached_analysis(self, environment: str, cache_key: tuple,
+                               result: Dict) -> None:
+        """Record an analysis result with its freshness markers."""
+        entry = (time.time(), self._current_xact_commit(environment), result)
+        with self._analysis_cache_lock:
+            self._analysis_cache[(environment,) + cache_key] = entry
     
-    def analyze_table_sizes(self, environment: str, limit: int = 50) -> Dict[str, Any]:
+    @staticmethod
+    def _size_rows_from_bundle(bundle: pd.DataFrame, limit: int) -> List[Dict]:
+        """Derive the table-size rowset from a pre-fetched Layer-1 bundle.
+
+        Column arithmetic runs vectorized; Python only assembles the final
+        row dicts from plain-int column lists.
+        """
+        sized = bundle[bundle['total_size_bytes'].notna()]
+        sized = sized.sort_values('total_size_bytes', ascending=False).head(limit)
+
+        schemas = sized['schemaname'].tolist()
+        tables = sized['tablename'].tolist()
+        totals = sized['total_size_bytes'].astype('int64').tolist()
+        table_sizes = sized['table_size_bytes'].astype('int64').tolist()
+        index_sizes = (sized['total_size_bytes'].astype('int64')
+                       - sized['table_size_bytes'].astype('int64')).tolist()
+
+        return [
+            {
+                'schemaname': schema,
+                'tablename': table,
+                'full_table_name': f"{schema}.{table}",
+                'total_size': format_bytes(total_bytes),
+                'total_size_bytes': total_bytes,
+                'table_size': format_bytes(table_bytes),
+                'table_size_bytes': table_bytes,
+                'index_size': format_bytes(index_bytes),
+                'index_size_bytes': index_bytes
+            }
+            for schema, table, total_bytes, table_bytes, index_bytes
+            in zip(schemas, tables, totals, table_sizes, index_sizes)
+        ]
+
+    def analyze_table_sizes(self, environment: str, limit: int = 50,
+                            bundle: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """Analyze tables by storage size to identify database gravity center."""
         logger.info(f"Analyzing table sizes for {environment} (top {limit})")
         
-        query = """
-        SELECT 
+        # Sizes come straight off pg_class oids — no qualified-name string
+        # building or regclass name->oid lookup per row; category counts and
+        # totals ride along as FILTER window aggregates so Python receives
+        # the summary pre-computed in the same round trip
+        query = f"""
+        WITH sized AS (
+            SELECT
+                n.nspname as schemaname,
+                c.relname as tablename,
+                pg_total_relation_size(c.oid) as total_size_bytes,
+                pg_relation_size(c.oid) as table_size_bytes
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE c.relkind IN ('r', 'p', 'm')
+            AND n.nspname NOT IN ('information_schema', 'pg_catalog')
+            AND n.nspname NOT LIKE 'pg_%%'
+            ORDER BY pg_total_relation_size(c.oid) DESC
+            LIMIT %s
+        )
+        SELECT
             schemaname,
             tablename,
             schemaname || '.' || tablename as full_table_name,
-            pg_size_pretty(pg_total_relation_size(schemaname||'.'||tablename)) as total_size,
-            pg_total_relation_size(schemaname||'.'||tablename) as total_size_bytes,
-            pg_size_pretty(pg_relation_size(schemaname||'.'||tablename)) as table_size,
-            pg_relation_size(schemaname||'.'||tablename) as table_size_bytes,
-            pg_size_pretty(pg_total_relation_size(schemaname||'.'||tablename) - 
-                          pg_relation_size(schemaname||'.'||tablename)) as index_size,
-            (pg_total_relation_size(schemaname||'.'||tablename) - 
-             pg_relation_size(schemaname||'.'||tablename)) as index_size_bytes
-        FROM pg_tables 
-        WHERE schemaname NOT IN ('information_schema', 'pg_catalog')
-        AND schemaname NOT LIKE 'pg_%'
-        ORDER BY pg_total_relation_size(schemaname||'.'||tablename) DESC
-        LIMIT %s
+            pg_size_pretty(total_size_bytes) as total_size,
+            total_size_bytes,
+            pg_size_pretty(table_size_bytes) as table_size,
+            table_size_bytes,
+            pg_size_pretty(total_size_bytes - table_size_bytes) as index_size,
+            (total_size_bytes - table_size_bytes) as index_size_bytes,
+            count(*) FILTER (WHERE total_size_bytes > {self.LARGE_TABLE_THRESHOLD_BYTES})
+                OVER () as large_count,
+            count(*) FILTER (WHERE total_size_bytes BETWEEN {self.SMALL_TABLE_THRESHOLD_BYTES}
+                AND {self.LARGE_TABLE_THRESHOLD_BYTES}) OVER () as medium_count,
+            count(*) FILTER (WHERE total_size_bytes < {self.SMALL_TABLE_THRESHOLD_BYTES})
+                OVER () as small_count,
+            sum(total_size_bytes) OVER () as sum_total_bytes,
+            sum(table_size_bytes) OVER () as sum_table_bytes
+        FROM sized
+        ORDER BY total_size_bytes DESC
         """
-        
+
+        summary_keys = ('large_count', 'medium_count', 'small_count',
+                        'sum_total_bytes', 'sum_table_bytes')
+
+        use_cache = bundle is None
+        cache_key = ('table_sizes', limit)
+        if use_cache:
+            cached = self._get_cached_analysis(environment, cache_key)
+            if cached is not None:
+                return cached
+
         try:
-            size_analysis = self.db_connection.execute_query(environment, query, (limit,))
-            
-            # Calculate summary statistics
-            total_size_bytes = sum(t['total_size_bytes'] for t in size_analysis)
-            total_table_bytes = sum(t['table_size_bytes'] for t in size_analysis)
-            total_index_bytes = sum(t['index_size_bytes'] for t in size_analysis)
-            
-            # Identify size categories
-            large_tables = [t for t in size_analysis if t['total_size_bytes'] > 1024*1024*100]  # >100MB
-            medium_tables = [t for t in size_analysis if 1024*1024*10 <= t['total_size_bytes'] <= 1024*1024*100]  # 10-100MB
-            small_tables = [t for t in size_analysis if t['total_size_bytes'] < 1024*1024*10]  # <10MB
-            
-            logger.info(f"Size analysis complete: {len(large_tables)} large, "
-                       f"{len(medium_tables)} medium, {len(small_tables)} small tables")
-            
-            return {
+            sql_summary = None
+            if bundle is not None and not bundle.empty:
+                size_analysis = self._size_rows_from_bundle(bundle, limit)
+            else:
+                # Static template parameterized only by limit: PREPARE once
+                # per pooled connection, EXECUTE afterwards
+                rows = self.db_connection.prepared_execute(
+                    environment, 'sizing_top_tables', query, (limit,)
+                )
+                if rows:
+                    sql_summary = {key: rows[0][key] for key in summary_keys}
+                size_analysis = [
+                    {key: value for key, value in row.items()
+                     if key not in summary_keys}
+                    for row in rows
+                ]
+
+            sizes = _int_column(size_analysis, 'total_size_bytes')
+            if sql_summary is not None:
+                total_size_bytes = int(sql_summary['sum_total_bytes'] or 0)
+                total_table_bytes = int(sql_summary['sum_table_bytes'] or 0)
+            else:
+                # Bundle path: totals from C-level column passes
+                total_size_bytes = int(sizes.sum())
+                total_table_bytes = int(_int_column(size_analysis, 'table_size_bytes').sum())
+            total_index_bytes = total_size_bytes - total_table_bytes
+
+            # Identify size categories (>100MB, 10-100MB, <10MB); rows are
+            # sorted by size, so capped buckets keep exactly the top 10
+            large_mask = sizes > self.LARGE_TABLE_THRESHOLD_BYTES
+            small_mask = sizes < self.SMALL_TABLE_THRESHOLD_BYTES
+            buckets, bucket_counts = _partition(size_analysis, {
+                'large': large_mask,
+                'medium': ~large_mask & ~small_mask,
+                'small': small_mask
+            }, caps={'large': 10, 'medium': 10, 'small': 10})
+            large_tables = buckets['large']
+            medium_tables = buckets['medium']
+            small_tables = buckets['small']
+
+            if sql_summary is not None:
+                size_categories = {
+                    'large_tables_100mb_plus': int(sql_summary['large_count'] or 0),
+                    'medium_tables_10_100mb': int(sql_summary['medium_count'] or 0),
+                    'small_tables_under_10mb': int(sql_summary['small_count'] or 0)
+                }
+            else:
+                size_categories = {
+                    'large_tables_100mb_plus': bucket_counts['large'],
+                    'medium_tables_10_100mb': bucket_counts['medium'],
+                    'small_tables_under_10mb': bucket_counts['small']
+                }
+
+            logger.info(f"Size analysis complete: "
+                       f"{size_categories['large_tables_100mb_plus']} large, "
+                       f"{size_categories['medium_tables_10_100mb']} medium, "
+                       f"{size_categories['small_tables_under_10mb']} small tables")
+
+            total_pretty, table_pretty, index_pretty = format_bytes_batch(
+                np.array([total_size_bytes, total_table_bytes, total_index_bytes])
+            )
+            result = {
                 'environment': environment,
                 'analysis_metadata': {
                     'top_tables_analyzed': len(size_analysis),
-                    'total_size_analyzed': format_bytes(total_size_bytes),
-                    'table_data_size': format_bytes(total_table_bytes),
-                    'index_size': format_bytes(total_index_bytes)
-                },
-                'size_categories': {
-                    'large_tables_100mb_plus': len(large_tables),
-                    'medium_tables_10_100mb': len(medium_tables),
-                    'small_tables_under_10mb': len(small_tables)
+                    'total_size_analyzed': total_pretty,
+                    'table_data_size': table_pretty,
+                    'index_size': index_pretty
                 },
+                'size_categories': size_categories,
                 'detailed_analysis': size_analysis,
                 'size_breakdown': {
                     'large_tables': large_tables[:10],  # Top 10 large tables
@@ -90,61 +292,123 @@ class TableSizingAnalyzer:
                     'small_tables': small_tables[:10]
                 }
             }
-            
+            if use_cache:
+                self._store_cached_analysis(environment, cache_key, result)
+            return result
+
         except Exception as e:
             logger.error(f"Table size analysis failed for {environment}: {e}")
             raise
     
-    def analyze_row_counts(self, environment: str, limit: int = 50) -> Dict[str, Any]:
+    @staticmethod
+    def _row_count_rows_from_bundle(bundle: pd.DataFrame, limit: int) -> List[Dict]:
+        """Derive the row-count rowset from a pre-fetched Layer-1 bundle.
+
+        NULL handling and int conversion happen as vectorized column passes
+        before the row dicts are assembled.
+        """
+        stats = bundle[bundle['n_live_tup'].notna()]
+        stats = stats.sort_values('n_live_tup', ascending=False).head(limit)
+
+        columns = {
+            'schemaname': stats['schemaname'].tolist(),
+            'tablename': stats['tablename'].tolist(),
+            'estimated_row_count': stats['n_live_tup'].astype('int64').tolist(),
+            'dead_row_count': stats['n_dead_tup'].fillna(0).astype('int64').tolist(),
+            'total_inserts': stats['n_tup_ins'].fillna(0).astype('int64').tolist(),
+            'total_updates': stats['n_tup_upd'].fillna(0).astype('int64').tolist(),
+            'total_deletes': stats['n_tup_del'].fillna(0).astype('int64').tolist(),
+            'last_vacuum': stats['last_vacuum'].tolist(),
+            'last_autovacuum': stats['last_autovacuum'].tolist(),
+            'last_analyze': stats['last_analyze'].tolist(),
+            'last_autoanalyze': stats['last_autoanalyze'].tolist()
+        }
+
+        row_counts = []
+        for index in range(len(stats)):
+            row = {key: values[index] for key, values in columns.items()}
+            row['full_table_name'] = f"{row['schemaname']}.{row['tablename']}"
+            row_counts.append(row)
+
+        return row_counts
+
+    def analyze_row_counts(self, environment: str, limit: int = 50,
+                           bundle: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """Analyze tables by row count to identify fact vs dimension tables."""
         logger.info(f"Analyzing table row counts for {environment} (top {limit})")
         
+        # pg_class.reltuples drives the ranking: filtering on relkind before
+        # touching the stats view keeps the sort off the full
+        # pg_stat_user_tables join on catalogs with many tables
         query = """
-        SELECT 
-            schemaname,
-            tablename,
-            schemaname || '.' || tablename as full_table_name,
-            n_live_tup as estimated_row_count,
-            n_dead_tup as dead_row_count,
-            n_tup_ins as total_inserts,
-            n_tup_upd as total_updates,
-            n_tup_del as total_deletes,
-            last_vacuum,
-            last_autovacuum,
-            last_analyze,
-            last_autoanalyze
-        FROM pg_stat_user_tables
-        ORDER BY n_live_tup DESC NULLS LAST
+        SELECT
+            n.nspname as schemaname,
+            c.relname as tablename,
+            n.nspname || '.' || c.relname as full_table_name,
+            greatest(c.reltuples::bigint, 0) as estimated_row_count,
+            COALESCE(s.n_dead_tup, 0) as dead_row_count,
+            COALESCE(s.n_tup_ins, 0) as total_inserts,
+            COALESCE(s.n_tup_upd, 0) as total_updates,
+            COALESCE(s.n_tup_del, 0) as total_deletes,
+            s.last_vacuum,
+            s.last_autovacuum,
+            s.last_analyze,
+            s.last_autoanalyze
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+        WHERE c.relkind IN ('r', 'p')
+        AND n.nspname NOT IN ('pg_catalog', 'information_schema')
+        AND n.nspname NOT LIKE 'pg_%%'
+        ORDER BY c.reltuples DESC NULLS LAST
         LIMIT %s
         """
-        
+
+        use_cache = bundle is None
+        cache_key = ('row_counts', limit)
+        if use_cache:
+            cached = self._get_cached_analysis(environment, cache_key)
+            if cached is not None:
+                return cached
+
         try:
-            row_analysis = self.db_connection.execute_query(environment, query, (limit,))
-            
-            # Calculate summary statistics
-            total_estimated_rows = sum(t.get('estimated_row_count', 0) or 0 for t in row_analysis)
-            
-            # Categorize by row count patterns (typical business patterns)
-            fact_tables = [t for t in row_analysis if (t.get('estimated_row_count', 0) or 0) > 100000]  # >100K rows
-            dimension_tables = [t for t in row_analysis if (t.get('estimated_row_count', 0) or 0) <= 100000]  # <=100K rows
-            
-            # Identify highly active tables (lots of inserts/updates)
-            active_tables = [t for t in row_analysis 
-                           if (t.get('total_inserts', 0) or 0) + (t.get('total_updates', 0) or 0) > 10000]
-            
-            logger.info(f"Row analysis complete: {len(fact_tables)} fact-like tables, "
-                       f"{len(dimension_tables)} dimension-like tables")
+            if bundle is not None and not bundle.empty:
+                row_analysis = self._row_count_rows_from_bundle(bundle, limit)
+            else:
+                row_analysis = self.db_connection.prepared_execute(
+                    environment, 'sizing_top_rowcounts', query, (limit,)
+                )
+
+            # Categorize by row count patterns (typical business patterns):
+            # one array pass replaces three list comprehensions
+            row_counts = _int_column(row_analysis, 'estimated_row_count')
+            total_estimated_rows = int(row_counts.sum())
+
+            fact_mask = row_counts > 100000  # >100K rows
+            churn = (_int_column(row_analysis, 'total_inserts')
+                     + _int_column(row_analysis, 'total_updates'))
+            buckets, bucket_counts = _partition(row_analysis, {
+                'fact': fact_mask,
+                'dimension': ~fact_mask,
+                'active': churn > 10000
+            }, caps={'fact': 15, 'dimension': 15, 'active': 10})
+            fact_tables = buckets['fact']
+            dimension_tables = buckets['dimension']
+            active_tables = buckets['active']
             
-            return {
+            logger.info(f"Row analysis complete: {bucket_counts['fact']} fact-like tables, "
+                       f"{bucket_counts['dimension']} dimension-like tables")
+
+            result = {
                 'environment': environment,
                 'analysis_metadata': {
                     'tables_analyzed': len(row_analysis),
                     'total_estimated_rows': total_estimated_rows
                 },
                 'table_categories': {
-                    'fact_tables_100k_plus': len(fact_tables),
-                    'dimension_tables_under_100k': len(dimension_tables),
-                    'highly_active_tables': len(active_tables)
+                    'fact_tables_100k_plus': bucket_counts['fact'],
+                    'dimension_tables_under_100k': bucket_counts['dimension'],
+                    'highly_active_tables': bucket_counts['active']
                 },
                 'detailed_analysis': row_analysis,
                 'category_breakdown': {
@@ -153,88 +417,263 @@ class TableSizingAnalyzer:
                     'highly_active_tables': active_tables[:10]
                 }
             }
-            
+            if use_cache:
+                self._store_cached_analysis(environment, cache_key, result)
+            return result
+
         except Exception as e:
             logger.error(f"Row count analysis failed for {environment}: {e}")
             raise
     
-    def analyze_table_activity_patterns(self, environment: str) -> Dict[str, Any]:
+    @staticmethod
+    def _activity_frame(bundle: pd.DataFrame) -> pd.DataFrame:
+        """Derive the churn-sorted activity frame from a Layer-1 bundle.
+
+        Percentages, category flags and the activity sort key are computed
+        as vectorized column passes.
+        """
+        active = bundle[bundle['n_live_tup'].notna() & (bundle['n_live_tup'] > 0)].copy()
+
+        live = active['n_live_tup'].astype('int64')
+        dead = active['n_dead_tup'].fillna(0).astype('int64')
+        seq_scans = active['seq_scan'].fillna(0).astype('int64')
+        idx_scans = active['idx_scan'].fillna(0).astype('int64')
+        total_scans = seq_scans + idx_scans
+        inserts = active['n_tup_ins'].fillna(0).astype('int64')
+        updates = active['n_tup_upd'].fillna(0).astype('int64')
+        deletes = active['n_tup_del'].fillna(0).astype('int64')
+
+        active['_dead_pct'] = (dead / live * 100).round(2)
+        active['_idx_pct'] = np.where(
+            total_scans > 0, (idx_scans / total_scans.replace(0, 1) * 100).round(2), 0
+        )
+        active['_churn'] = inserts + updates + deletes
+
+        # Category flags mirror the boolean columns of the SQL path, so the
+        # summarizer treats both row sources identically
+        active['_read_heavy'] = total_scans > active['_churn']
+        active['_write_heavy'] = active['_churn'] > total_scans
+        active['_maintenance'] = active['_dead_pct'] > 20
+        active['_low_index'] = (active['_idx_pct'] < 50) & (seq_scans > 100)
+        return active.sort_values('_churn', ascending=False)
+
+    def _summarize_activity_bundle(self, bundle: pd.DataFrame) -> Dict[str, Any]:
+        """Vectorized equivalent of _summarize_activity for bundle frames.
+
+        The four category tests are packed into one uint8 bit-flag array,
+        so counts and per-category selection run as single C passes, and
+        row dicts are assembled only for the rows that actually appear in
+        the report instead of the whole frame.
+        """
+        active = self._activity_frame(bundle)
+
+        flags = (active['_read_heavy'].to_numpy(dtype=np.uint8)
+                 | (active['_write_heavy'].to_numpy(dtype=np.uint8) << 1)
+                 | (active['_maintenance'].to_numpy(dtype=np.uint8) << 2)
+                 | (active['_low_index'].to_numpy(dtype=np.uint8) << 3))
+
+        # Rows are churn-sorted, so the first matches per bit are the most
+        # active ones — same selection the streaming summarizer makes
+        read_idx = np.flatnonzero(flags & 1)[:10]
+        write_idx = np.flatnonzero(flags & 2)[:10]
+        maintenance_idx = np.flatnonzero(flags & 4)[:self.ACTIVITY_LIST_CAP]
+        low_index_idx = np.flatnonzero(flags & 8)[:self.ACTIVITY_LIST_CAP]
+        detailed_idx = np.arange(min(30, len(active)))
+
+        columns = {
+            'schemaname': active['schemaname'].tolist(),
+            'tablename': active['tablename'].tolist(),
+            'sequential_scans': active['seq_scan'].fillna(0).astype('int64').tolist(),
+            'sequential_tuples_read': active['seq_tup_read'].fillna(0).astype('int64').tolist(),
+            'index_scans': active['idx_scan'].fillna(0).astype('int64').tolist(),
+            'index_tuples_fetched': active['idx_tup_fetch'].fillna(0).astype('int64').tolist(),
+            'inserts': active['n_tup_ins'].fillna(0).astype('int64').tolist(),
+            'updates': active['n_tup_upd'].fillna(0).astype('int64').tolist(),
+            'deletes': active['n_tup_del'].fillna(0).astype('int64').tolist(),
+            'live_tuples': active['n_live_tup'].astype('int64').tolist(),
+            'dead_tuples': active['n_dead_tup'].fillna(0).astype('int64').tolist(),
+            'dead_tuple_percentage': active['_dead_pct'].tolist(),
+            'index_usage_percentage': active['_idx_pct'].tolist(),
+            'read_heavy': active['_read_heavy'].tolist(),
+            'write_heavy': active['_write_heavy'].tolist(),
+            'maintenance_needed': active['_maintenance'].tolist(),
+            'low_index_usage': active['_low_index'].tolist()
+        }
+
+        row_cache: Dict[int, Dict] = {}
+
+        def rows_at(indices: np.ndarray) -> List[Dict]:
+            rows = []
+            for index in indices.tolist():
+                row = row_cache.get(index)
+                if row is None:
+                    row = {key: values[index] for key, values in columns.items()}
+                    row['full_table_name'] = f"{row['schemaname']}.{row['tablename']}"
+                    row_cache[index] = row
+                rows.append(row)
+            return rows
+
+        return {
+            'analysis_metadata': {
+                'total_active_tables': len(active),
+                'read_heavy_tables': int(np.count_nonzero(flags & 1)),
+                'write_heavy_tables': int(np.count_nonzero(flags & 2)),
+                'maintenance_needed': int(np.count_nonzero(flags & 4)),
+                'optimization_candidates': int(np.count_nonzero(flags & 8))
+            },
+            'activity_patterns': {
+                'read_heavy_tables': rows_at(read_idx),
+                'write_heavy_tables': rows_at(write_idx),
+                'maintenance_needed': rows_at(maintenance_idx),
+                'low_index_usage': rows_at(low_index_idx)
+            },
+            'detailed_analysis': rows_at(detailed_idx)
+        }
+
+    def analyze_table_activity_patterns(self, environment: str,
+                                        bundle: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """Analyze table activity patterns to understand business processes."""
         logger.info(f"Analyzing table activity patterns for {environment}")
         
+        # Category tags are computed server-side as boolean columns, so the
+        # streaming summarizer only reads flags instead of re-deriving each
+        # category from the counters per row
         query = """
-        SELECT 
+        WITH activity AS (
+        SELECT
             schemaname,
             tablename,
             schemaname || '.' || tablename as full_table_name,
-            seq_scan as sequential_scans,
-            seq_tup_read as sequential_tuples_read,
-            idx_scan as index_scans,
-            idx_tup_fetch as index_tuples_fetched,
-            n_tup_ins as inserts,
-            n_tup_upd as updates,
-            n_tup_del as deletes,
+            COALESCE(seq_scan, 0) as sequential_scans,
+            COALESCE(seq_tup_read, 0) as sequential_tuples_read,
+            COALESCE(idx_scan, 0) as index_scans,
+            COALESCE(idx_tup_fetch, 0) as index_tuples_fetched,
+            COALESCE(n_tup_ins, 0) as inserts,
+            COALESCE(n_tup_upd, 0) as updates,
+            COALESCE(n_tup_del, 0) as deletes,
             n_live_tup as live_tuples,
-            n_dead_tup as dead_tuples,
-            CASE 
-                WHEN n_live_tup > 0 THEN round((n_dead_tup::numeric / n_live_tup::numeric) * 100, 2)
-                ELSE 0 
+            COALESCE(n_dead_tup, 0) as dead_tuples,
+            CASE
+                WHEN n_live_tup > 0 THEN
+                    round((COALESCE(n_dead_tup, 0)::numeric / n_live_tup::numeric) * 100, 2)
+                ELSE 0
             END as dead_tuple_percentage,
             CASE
-                WHEN seq_scan + idx_scan > 0 THEN 
-                    round((idx_scan::numeric / (seq_scan + idx_scan)::numeric) * 100, 2)
+                WHEN COALESCE(seq_scan, 0) + COALESCE(idx_scan, 0) > 0 THEN
+                    round((COALESCE(idx_scan, 0)::numeric /
+                           (COALESCE(seq_scan, 0) + COALESCE(idx_scan, 0))::numeric) * 100, 2)
                 ELSE 0
             END as index_usage_percentage
         FROM pg_stat_user_tables
         WHERE n_live_tup > 0
-        ORDER BY (n_tup_ins + n_tup_upd + n_tup_del) DESC
+        )
+        SELECT
+            activity.*,
+            (sequential_scans + index_scans) >
+                (inserts + updates + deletes) as read_heavy,
+            (inserts + updates + deletes) >
+                (sequential_scans + index_scans) as write_heavy,
+            dead_tuple_percentage > 20 as maintenance_needed,
+            (index_usage_percentage < 50 AND sequential_scans > 100) as low_index_usage
+        FROM activity
+        ORDER BY (inserts + updates + deletes) DESC
         """
-        
+
+        use_cache = bundle is None
+        cache_key = ('activity',)
+        if use_cache:
+            cached = self._get_cached_analysis(environment, cache_key)
+            if cached is not None:
+                return cached
+
         try:
-            activity_analysis = self.db_connection.execute_query(environment, query)
-            
-            # Categorize tables by activity patterns
-            read_heavy = [t for t in activity_analysis 
-                         if (t.get('sequential_scans', 0) or 0) + (t.get('index_scans', 0) or 0) > 
-                             (t.get('inserts', 0) or 0) + (t.get('updates', 0) or 0) + (t.get('deletes', 0) or 0)]
-            
-            write_heavy = [t for t in activity_analysis 
-                          if (t.get('inserts', 0) or 0) + (t.get('updates', 0) or 0) + (t.get('deletes', 0) or 0) > 
-                              (t.get('sequential_scans', 0) or 0) + (t.get('index_scans', 0) or 0)]
-            
-            # Tables with high dead tuple percentage (needs attention)
-            maintenance_needed = [t for t in activity_analysis 
-                                if (t.get('dead_tuple_percentage', 0) or 0) > 20]
-            
-            # Tables with low index usage (potential optimization)
-            low_index_usage = [t for t in activity_analysis 
-                             if (t.get('index_usage_percentage', 0) or 0) < 50 and 
-                                (t.get('sequential_scans', 0) or 0) > 100]
-            
-            logger.info(f"Activity analysis complete: {len(read_heavy)} read-heavy, "
-                       f"{len(write_heavy)} write-heavy tables")
-            
-            return {
-                'environment': environment,
-                'analysis_metadata': {
-                    'total_active_tables': len(activity_analysis),
-                    'read_heavy_tables': len(read_heavy),
-                    'write_heavy_tables': len(write_heavy),
-                    'maintenance_needed': len(maintenance_needed),
-                    'optimization_candidates': len(low_index_usage)
-                },
-                'activity_patterns': {
-                    'read_heavy_tables': read_heavy[:10],
-                    'write_heavy_tables': write_heavy[:10],
-                    'maintenance_needed': maintenance_needed,
-                    'low_index_usage': low_index_usage
-                },
-                'detailed_analysis': activity_analysis[:30]  # Top 30 most active
-            }
-            
+            if bundle is not None and not bundle.empty:
+                summary = self._summarize_activity_bundle(bundle)
+            else:
+                # No LIMIT on the activity query: stream it from a
+                # server-side cursor instead of materializing every user
+                # table in memory
+                rows = self.db_connection.iter_query(
+                    environment, query, itersize=2000
+                )
+                summary = self._summarize_activity(rows)
+
+            logger.info(f"Activity analysis complete: "
+                       f"{summary['analysis_metadata']['read_heavy_tables']} read-heavy, "
+                       f"{summary['analysis_metadata']['write_heavy_tables']} write-heavy tables")
+
+            result = {'environment': environment, **summary}
+            if use_cache:
+                self._store_cached_analysis(environment, cache_key, result)
+            return result
+
         except Exception as e:
             logger.error(f"Activity pattern analysis failed for {environment}: {e}")
             raise
+
+    # Category lists retained per bucket; only counts are unbounded
+    ACTIVITY_LIST_CAP = 200
+
+    def _summarize_activity(self, rows) -> Dict[str, Any]:
+        """Fold the activity rowset into categories in one streaming pass.
+
+        Rows must arrive ordered by write activity (both the SQL and the
+        bundle path sort that way), so the first matches per bucket are the
+        most active ones. Memory stays bounded by the retention caps.
+        """
+        counts = {'total': 0, 'read_heavy': 0, 'write_heavy': 0,
+                  'maintenance': 0, 'low_index': 0}
+        read_heavy: List[Dict] = []
+        write_heavy: List[Dict] = []
+        maintenance_needed: List[Dict] = []
+        low_index_usage: List[Dict] = []
+        detailed: List[Dict] = []
+
+        # Both row sources pre-compute the category flags (SQL boolean
+        # columns / vectorized bundle columns), so the loop only tests them
+        for t in rows:
+            counts['total'] += 1
+
+            if t['read_heavy']:
+                counts['read_heavy'] += 1
+                if len(read_heavy) < 10:
+                    read_heavy.append(t)
+            elif t['write_heavy']:
+                counts['write_heavy'] += 1
+                if len(write_heavy) < 10:
+                    write_heavy.append(t)
+
+            # High dead-tuple percentage needs attention
+            if t['maintenance_needed']:
+                counts['maintenance'] += 1
+                if len(maintenance_needed) < self.ACTIVITY_LIST_CAP:
+                    maintenance_needed.append(t)
+
+            # Low index usage is a potential optimization
+            if t['low_index_usage']:
+                counts['low_index'] += 1
+                if len(low_index_usage) < self.ACTIVITY_LIST_CAP:
+                    low_index_usage.append(t)
+
+            if len(detailed) < 30:  # Top 30 most active
+                detailed.append(t)
+
+        return {
+            'analysis_metadata': {
+                'total_active_tables': counts['total'],
+                'read_heavy_tables': counts['read_heavy'],
+                'write_heavy_tables': counts['write_heavy'],
+                'maintenance_needed': counts['maintenance'],
+                'optimization_candidates': counts['low_index']
+            },
+            'activity_patterns': {
+                'read_heavy_tables': read_heavy,
+                'write_heavy_tables': write_heavy,
+                'maintenance_needed': maintenance_needed,
+                'low_index_usage': low_index_usage
+            },
+            'detailed_analysis': detailed
+        }
     
     def generate_sizing_report(self, environment: str) -> str:
         """Generate comprehensive table sizing and granularity report."""
@@ -243,10 +682,26 @@ class TableSizingAnalyzer:
         report = ArchaeologyReport(environment)
         
         try:
-            # Gather all sizing data
-            size_analysis = self.analyze_table_sizes(environment)
-            row_analysis = self.analyze_row_counts(environment)
-            activity_analysis = self.analyze_table_activity_patterns(environment)
+            # One fused catalog round trip feeds all three analyses instead
+            # of three independent scans
+            bundle = DatabaseInventory(self.db_connection).fetch_layer1_bundle(environment)
+
+            # The three analyses are independent, so they run concurrently;
+            # any fallback queries draw their own pooled connections
+            with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+                size_future = executor.submit(
+                    self.analyze_table_sizes, environment, bundle=bundle
+                )
+                row_future = executor.submit(
+                    self.analyze_row_counts, environment, bundle=bundle
+                )
+                activity_future = executor.submit(
+                    self.analyze_table_activity_patterns, environment, bundle=bundle
+                )
+
+                size_analysis = size_future.result()
+                row_analysis = row_future.result()
+                activity_analysis = activity_future.result()
             
             # Add sections to report
             report.add_section('table_size_analysis', size_analysis)
@@ -263,36 +718,62 @@ class TableSizingAnalyzer:
             logger.error(f"Sizing report generation failed: {e}")
             raise
 
+    def generate_sizing_reports(self, environments: List[str],
+                                max_workers: Optional[int] = None) -> Dict[str, Optional[str]]:
+        """Generate sizing reports for a fleet of environments in parallel.
+
+        Each environment draws from its own connection pool, so reports run
+        concurrently on threads; within each report the three analyses
+        already fire concurrently as well. A failing environment is logged
+        and reported as None instead of aborting the rest of the fleet.
+        """
+        logger.info(f"Generating sizing reports for {len(environments)} environments")
+
+        workers = max_workers or min(len(environments), 4)
+        results: Dict[str, Optional[str]] = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.generate_sizing_report, environment): environment
+                for environment in environments
+            }
+            for future in concurrent.futures.as_completed(futures):
+                environment = futures[future]
+                try:
+                    results[environment] = future.result()
+                except Exception as e:
+                    logger.error(f"Sizing report failed for {environment}: {e}")
+                    results[environment] = None
+
+        return results
+
 
 def main():
     """Command-line interface for table sizing analysis."""
-    import sys
-    
-    # Handle relative imports for both package usage and direct execution
-    try:
-        from ..core.utils import setup_logging
-    except ImportError:
-        # Direct execution - add parent directories to path
-        import os
-        sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        from core.utils import setup_logging
-    
+    # Module import already resolved setup_logging for both execution modes
     setup_logging()
     
     if len(sys.argv) < 2:
-        print("Usage: python -m data_archaeologist.layer1_physical.table_sizing <environment>")
+        print("Usage: python -m data_archaeologist.layer1_physical.table_sizing "
+              "<environment> [<environment> ...]")
         sys.exit(1)
-    
-    environment = sys.argv[1]
-    
+
+    environments = sys.argv[1:]
+
     try:
         db_conn = DatabaseConnection()
         analyzer = TableSizingAnalyzer(db_conn)
-        
-        print(f"Starting table sizing analysis for {environment}...")
-        report_file = analyzer.generate_sizing_report(environment)
-        print(f"Sizing analysis complete. Report saved: {report_file}")
-        
+
+        if len(environments) == 1:
+            print(f"Starting table sizing analysis for {environments[0]}...")
+            report_file = analyzer.generate_sizing_report(environments[0])
+            print(f"Sizing analysis complete. Report saved: {report_file}")
+        else:
+            print(f"Starting table sizing analysis for {len(environments)} environments...")
+            reports = analyzer.generate_sizing_reports(environments)
+            for environment, report_file in sorted(reports.items()):
+                status = report_file if report_file else "FAILED"
+                print(f"  {environment}: {status}")
+
     except Exception as e:
         logger.error(f"Table sizing analysis failed: {e}")
         sys.exit(1)
@@ -6,70 +6,207 @@ This module analyzes the "traffic flow" between tables to understand
 one-to-many, many-to-many, and other relationship patterns.
 """
 
+import concurrent.futures
+import gzip
+import hashlib
 import logging
 import sys
 import os
-from typing import Dict, List, Any, Optional
+import threading
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
 
 # Handle relative imports for both package usage and direct execution
 try:
     from ..core.database_connection import DatabaseConnection
-    from ..core.utils import ArchaeologyReport
+    from ..core.utils import ArchaeologyReport, _dumps_line, generate_timestamp
+    from .foreign_key_detection import ForeignKeyDetective
 except ImportError:
     # Direct execution - add parent directories to path
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from core.database_connection import DatabaseConnection
-    from core.utils import ArchaeologyReport
+    from core.utils import ArchaeologyReport, _dumps_line, generate_timestamp
+    from layer2_logical.foreign_key_detection import ForeignKeyDetective
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class RelationshipCardinality:
+    """Fixed-attribute record for one analyzed relationship.
+
+    Each analysis used to allocate several nested dicts that the
+    categorizer re-indexed by string keys; a slots dataclass keeps the
+    per-record footprint flat and makes the hot categorization fields
+    (`pattern`, `integrity_score`, `has_orphaned_records`) plain attribute
+    reads. `to_dict` rebuilds the report shape at serialization time only.
+    """
+    source_table: str
+    source_column: str
+    target_table: str
+    target_column: str
+    pattern: str
+    cardinality_pattern: Dict[str, Any]
+    quality_metrics: Dict[str, Any]
+    business_insights: List[str]
+    integrity_score: float = 0.0
+    has_orphaned_records: bool = False
+    detailed_statistics: Optional[Dict[str, Any]] = None
+    relationship_type: Optional[str] = None
+    constraint_name: Optional[str] = None
+    confidence_score: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the report dict shape, omitting unset extras."""
+        record = {
+            'source_table': self.source_table,
+            'source_column': self.source_column,
+            'target_table': self.target_table,
+            'target_column': self.target_column,
+            'cardinality_pattern': self.cardinality_pattern,
+            'quality_metrics': self.quality_metrics,
+            'business_insights': self.business_insights
+        }
+        if self.detailed_statistics is not None:
+            record['detailed_statistics'] = self.detailed_statistics
+        if self.relationship_type is not None:
+            record['relationship_type'] = self.relationship_type
+        if self.constraint_name is not None:
+            record['constraint_name'] = self.constraint_name
+        if self.confidence_score is not None:
+            record['confidence_score'] = self.confidence_score
+        return record
+
+
+def _reduce_relationship(item: Tuple[Dict, Optional[Dict]],
+                         include_details: bool = False) -> RelationshipCardinality:
+    """Pure reduction from fetched statistics to a relationship record.
+
+    Module-level so it can be dispatched to worker processes. The raw stat
+    dict is only attached when `include_details` is set; by default reports
+    carry the labels and scores, not every counter they came from.
+    """
+    relationship, stats = item
+
+    if stats is None:
+        return CardinalityAnalyzer._create_failed_analysis(relationship)
+
+    cardinality_pattern = CardinalityAnalyzer._determine_cardinality_pattern(stats)
+    quality_metrics = CardinalityAnalyzer._calculate_relationship_quality(stats)
+    business_insights = CardinalityAnalyzer._generate_business_insights(
+        relationship, cardinality_pattern, quality_metrics
+    )
+
+    return RelationshipCardinality(
+        source_table=f"{relationship['source_schema']}.{relationship['source_table']}",
+        source_column=relationship['source_column'],
+        target_table=f"{relationship['target_schema']}.{relationship['target_table']}",
+        target_column=relationship['target_column'],
+        pattern=cardinality_pattern['pattern'],
+        cardinality_pattern=cardinality_pattern,
+        quality_metrics=quality_metrics,
+        business_insights=business_insights,
+        integrity_score=quality_metrics['referential_integrity_score'],
+        has_orphaned_records=quality_metrics['has_orphaned_records'],
+        detailed_statistics=dict(stats) if include_details else None
+    )
+
+
 class CardinalityAnalyzer:
     """Relationship cardinality analysis for understanding data flow patterns."""
     
-    def __init__(self, db_connection: DatabaseConnection):
+    # Tables at or above this row estimate take their target-side stats
+    # from the planner's statistics instead of an exact count scan
+    APPROX_MIN_ROWS = 100_000
+
+    # Block-sample percentage applied to huge source tables
+    SAMPLE_PERCENT = 1.0
+
+    def __init__(self, db_connection: DatabaseConnection, use_approx: bool = True,
+                 sample_threshold_rows: int = 10_000_000):
         self.db_connection = db_connection
-    
-    def analyze_all_relationships(self, environment: str) -> Dict[str, Any]:
-        """Analyze cardinality for all discovered relationships."""
+        # Cardinality classification compares ratios, not exact counts, so
+        # large targets can use pg_stats estimates instead of count(DISTINCT)
+        self.use_approx = use_approx
+        # Source tables above this reltuples estimate are scanned through
+        # TABLESAMPLE SYSTEM instead of in full; 0 disables sampling
+        self.sample_threshold_rows = sample_threshold_rows
+        # reltuples per (environment, schema, table), filled in one catalog
+        # query per batch
+        self._reltuples_cache: Dict[tuple, int] = {}
+        # Many relationships reference the same columns; per-column stats are
+        # computed once per (environment, schema, table, column)
+        self._col_stats_cache: Dict[tuple, Dict] = {}
+        self._col_stats_lock = threading.Lock()
+        # Single-column PK/UNIQUE columns per environment; a declared
+        # guarantee answers the duplicate question without any scan
+        self._unique_cols_cache: Dict[str, set] = {}
+        # Discovered FK inventory per environment, reused across reports in
+        # the same process until the TTL runs out
+        self._fk_cache: Dict[str, tuple] = {}
+
+    def analyze_all_relationships(self, environment: str,
+                                  include_details: bool = False,
+                                  stream_categories_to: Optional[str] = None) -> Dict[str, Any]:
+        """Analyze cardinality for all discovered relationships.
+
+        Set `include_details` to attach each relationship's raw stat dict;
+        by default only labels and scores travel into the report.
+        `stream_categories_to` diverts the per-pattern detail lists into
+        gzipped NDJSON shards under that directory.
+        """
         logger.info(f"Analyzing relationship cardinalities for {environment}")
         
         try:
             # Get all potential relationships from foreign key analysis
-            from .foreign_key_detection import ForeignKeyDetective
-            fk_detective = ForeignKeyDetective(self.db_connection)
-            
-            declared_fks = fk_detective.discover_declared_foreign_keys(environment)
-            potential_fks = fk_detective.discover_potential_foreign_keys(environment)
-            
+            declared_fks, potential_fks = self._load_fks(environment)
+
             # Analyze declared relationships
-            declared_cardinalities = []
-            for fk in declared_fks['declared_foreign_keys']:
-                cardinality = self._analyze_single_relationship(environment, {
-                    'source_schema': fk['source_schema'],
-                    'source_table': fk['source_table'],
-                    'source_column': fk['source_column'],
-                    'target_schema': fk['target_schema'],
-                    'target_table': fk['target_table'],
-                    'target_column': fk['target_column']
-                })
-                cardinality['relationship_type'] = 'declared_foreign_key'
-                cardinality['constraint_name'] = fk['constraint_name']
-                declared_cardinalities.append(cardinality)
-            
+            declared_jobs = [
+                (
+                    {
+                        'source_schema': fk['source_schema'],
+                        'source_table': fk['source_table'],
+                        'source_column': fk['source_column'],
+                        'target_schema': fk['target_schema'],
+                        'target_table': fk['target_table'],
+                        'target_column': fk['target_column']
+                    },
+                    {
+                        'relationship_type': 'declared_foreign_key',
+                        'constraint_name': fk['constraint_name']
+                    }
+                )
+                for fk in declared_fks['declared_foreign_keys']
+            ]
+            declared_cardinalities = self._analyze_relationships(
+                environment, declared_jobs, include_details
+            )
+
             # Analyze high-confidence potential relationships
-            potential_cardinalities = []
             high_confidence_relationships = potential_fks['confidence_categorization']['high_confidence']
-            
-            for rel in high_confidence_relationships:
-                cardinality = self._analyze_single_relationship(environment, rel)
-                cardinality['relationship_type'] = 'potential_foreign_key'
-                cardinality['confidence_score'] = rel['confidence_score']
-                potential_cardinalities.append(cardinality)
+            potential_jobs = [
+                (
+                    rel,
+                    {
+                        'relationship_type': 'potential_foreign_key',
+                        'confidence_score': rel['confidence_score']
+                    }
+                )
+                for rel in high_confidence_relationships
+            ]
+            potential_cardinalities = self._analyze_relationships(
+                environment, potential_jobs, include_details
+            )
             
             # Categorize by cardinality patterns
             cardinality_summary = self._categorize_cardinalities(
-                declared_cardinalities + potential_cardinalities
+                declared_cardinalities + potential_cardinalities,
+                stream_dir=stream_categories_to
             )
             
             logger.info(f"Analyzed {len(declared_cardinalities)} declared and "
@@ -84,8 +221,10 @@ class CardinalityAnalyzer:
                 },
                 'cardinality_breakdown': cardinality_summary,
                 'detailed_analysis': {
-                    'declared_relationships': declared_cardinalities,
-                    'potential_relationships': potential_cardinalities
+                    'declared_relationships': [rel.to_dict()
+                                               for rel in declared_cardinalities],
+                    'potential_relationships': [rel.to_dict()
+                                                for rel in potential_cardinalities]
                 }
             }
             
@@ -93,109 +232,541 @@ class CardinalityAnalyzer:
             logger.error(f"Relationship cardinality analysis failed for {environment}: {e}")
             raise
     
-    def _analyze_single_relationship(self, environment: str, 
-                                   relationship: Dict[str, str]) -> Dict[str, Any]:
+    # Discovered FK inventories stay valid this long within one process
+    FK_CACHE_TTL = 300.0
+
+    def _load_fks(self, environment: str) -> Tuple[Dict, Dict]:
+        """Run FK discovery, reusing a recent inventory for the environment.
+
+        Declared and potential FK discovery are both catalog scans; repeated
+        report generations in one process share one inventory per TTL
+        window.
+        """
+        cached = self._fk_cache.get(environment)
+        if cached is not None:
+            cached_at, declared_fks, potential_fks = cached
+            if time.monotonic() - cached_at < self.FK_CACHE_TTL:
+                logger.debug(f"Reusing cached FK inventory for {environment}")
+                return declared_fks, potential_fks
+
+        fk_detective = ForeignKeyDetective(self.db_connection)
+        declared_fks = fk_detective.discover_declared_foreign_keys(environment)
+        potential_fks = fk_detective.discover_potential_foreign_keys(environment)
+        self._fk_cache[environment] = (time.monotonic(), declared_fks, potential_fks)
+        return declared_fks, potential_fks
+
+    # Below this relationship count, dispatching reductions to worker
+    # processes costs more than it saves
+    REDUCE_PROCESS_THRESHOLD = 32
+
+    def _analyze_relationships(self, environment: str,
+                               jobs: List[Tuple[Dict, Dict]],
+                               include_details: bool = False
+                               ) -> List[RelationshipCardinality]:
+        """Fetch statistics for each relationship, then reduce them.
+
+        The I/O phase batches many relationships per round trip; the pure
+        reduction phase moves to a ProcessPoolExecutor when the relationship
+        set is large enough for multi-core aggregation to pay off.
+        """
+        relationships = [relationship for relationship, _ in jobs]
+        fetched = list(zip(
+            relationships,
+            self._fetch_relationship_stats_batch(environment, relationships)
+        ))
+
+        reduce = partial(_reduce_relationship, include_details=include_details)
+        if len(fetched) >= self.REDUCE_PROCESS_THRESHOLD:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                reduced = list(executor.map(reduce, fetched))
+        else:
+            reduced = [reduce(item) for item in fetched]
+
+        for analysis, (_, extra) in zip(reduced, jobs):
+            for key, value in extra.items():
+                setattr(analysis, key, value)
+
+        return reduced
+
+    def _analyze_single_relationship(self, environment: str,
+                                   relationship: Dict[str, str],
+                                   include_details: bool = False
+                                   ) -> RelationshipCardinality:
         """Analyze cardinality for a single relationship."""
-        try:
-            source_table = f'"{relationship["source_schema"]}"."{relationship["source_table"]}"'
-            source_column = f'"{relationship["source_column"]}"'
-            target_table = f'"{relationship["target_schema"]}"."{relationship["target_table"]}"'
-            target_column = f'"{relationship["target_column"]}"'
-            
-            # Comprehensive cardinality analysis
-            analysis_query = f"""
-            WITH source_analysis AS (
-                SELECT 
-                    count(*) as total_rows,
-                    count(DISTINCT {source_column}) as unique_values,
-                    count({source_column}) as non_null_values,
-                    count(*) - count({source_column}) as null_values,
-                    max(cnt) as max_duplicates
+        stats = self._fetch_relationship_stats(environment, relationship)
+        return _reduce_relationship((relationship, stats), include_details)
+
+    # One batched statement stays below this SQL text size; past it a new
+    # round trip starts
+    BATCH_SQL_SIZE_CAP = 512 * 1024
+
+    # Concurrent statistics batches in flight, bounded well under the
+    # connection pool's default size
+    FETCH_MAX_WORKERS = 8
+
+    @staticmethod
+    def _relationship_stats_subquery(rel_id: int, relationship: Dict[str, str],
+                                     sample_percent: Optional[float] = None) -> str:
+        """Build one relationship's statistics SELECT, tagged with rel_id.
+
+        One LEFT JOIN scan with FILTER aggregates produces the source and
+        join-dependent numbers together; joining against the distinct target
+        values keeps the counts correct when the target column holds
+        duplicates. Only the max-duplicates figure needs a second, grouped
+        pass over the source. Target-side stats come from
+        `_get_target_stats`, which is memoized across relationships.
+
+        With `sample_percent` set the source scans go through TABLESAMPLE
+        SYSTEM, turning full-table passes on huge sources into block
+        samples; `_scale_sampled_stats` scales the counts back up. The
+        distinct-target join side is never sampled — missing target values
+        would fabricate orphans.
+        """
+        source_table = f'"{relationship["source_schema"]}"."{relationship["source_table"]}"'
+        source_column = f'"{relationship["source_column"]}"'
+        target_table = f'"{relationship["target_schema"]}"."{relationship["target_table"]}"'
+        target_column = f'"{relationship["target_column"]}"'
+        # The alias precedes TABLESAMPLE in the FROM grammar
+        sample_clause = (f" TABLESAMPLE SYSTEM ({sample_percent})"
+                         if sample_percent else "")
+
+        return f"""
+        SELECT
+            {rel_id} as rel_id,
+            count(*) as total_rows,
+            count(DISTINCT s.{source_column}) as unique_values,
+            count(s.{source_column}) as non_null_values,
+            count(*) - count(s.{source_column}) as null_values,
+            count(*) FILTER (WHERE t.{target_column} IS NOT NULL) as matching_records,
+            count(DISTINCT s.{source_column})
+                FILTER (WHERE t.{target_column} IS NOT NULL) as matching_unique_source,
+            count(DISTINCT t.{target_column}) as matching_unique_target,
+            count(*) FILTER (WHERE s.{source_column} IS NOT NULL
+                             AND t.{target_column} IS NULL) as orphaned_records,
+            round(100.0 * (count(s.{source_column})
+                           - count(*) FILTER (WHERE s.{source_column} IS NOT NULL
+                                              AND t.{target_column} IS NULL))
+                  / nullif(count(s.{source_column}), 0), 2) as integrity_score,
+            round(100.0 * count(s.{source_column})
+                  / nullif(count(*), 0), 2) as completeness_score,
+            (
+                SELECT max(cnt)
                 FROM (
-                    SELECT {source_column}, count(*) as cnt
-                    FROM {source_table}
+                    SELECT count(*) as cnt
+                    FROM {source_table}{sample_clause}
                     WHERE {source_column} IS NOT NULL
                     GROUP BY {source_column}
-                ) dup_analysis, {source_table}
-            ),
-            target_analysis AS (
-                SELECT 
-                    count(*) as total_rows,
-                    count(DISTINCT {target_column}) as unique_values,
-                    count({target_column}) as non_null_values
-                FROM {target_table}
-            ),
-            relationship_analysis AS (
-                SELECT 
-                    count(*) as matching_records,
-                    count(DISTINCT s.{source_column}) as matching_unique_source,
-                    count(DISTINCT t.{target_column}) as matching_unique_target
-                FROM {source_table} s
-                INNER JOIN {target_table} t ON s.{source_column} = t.{target_column}
-                WHERE s.{source_column} IS NOT NULL
-            ),
-            orphan_analysis AS (
-                SELECT count(*) as orphaned_records
-                FROM {source_table} s
-                LEFT JOIN {target_table} t ON s.{source_column} = t.{target_column}
-                WHERE s.{source_column} IS NOT NULL AND t.{target_column} IS NULL
+                ) dup_analysis
+            ) as max_duplicates
+        FROM {source_table} s{sample_clause}
+        LEFT JOIN (
+            SELECT DISTINCT {target_column} FROM {target_table}
+        ) t ON s.{source_column} = t.{target_column}
+        """
+
+    def _warm_reltuples(self, environment: str,
+                        relationships: List[Dict[str, str]]) -> None:
+        """Fill the reltuples cache for all distinct source tables.
+
+        One pg_class lookup per batch decides which sources are big enough
+        to sample. Tables the query cannot see are cached as 0 rows, so
+        they fall back to exact scans rather than being re-queried.
+        """
+        if not self.sample_threshold_rows:
+            return
+        pending = []
+        for relationship in relationships:
+            cache_key = (environment, relationship['source_schema'],
+                         relationship['source_table'])
+            if cache_key not in self._reltuples_cache and cache_key not in pending:
+                pending.append(cache_key)
+        if not pending:
+            return
+
+        query = """
+        SELECT
+            n.nspname as schemaname,
+            c.relname as tablename,
+            greatest(c.reltuples::bigint, 0) as total_rows
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE (n.nspname, c.relname) IN %s
+        """
+        tables = tuple((schema, table) for _, schema, table in pending)
+        try:
+            for row in self.db_connection.execute_query(environment, query, (tables,)):
+                self._reltuples_cache[(environment, row['schemaname'],
+                                       row['tablename'])] = row['total_rows']
+        except Exception as e:
+            logger.warning(f"reltuples lookup failed ({len(pending)} tables): {e}")
+        for cache_key in pending:
+            self._reltuples_cache.setdefault(cache_key, 0)
+
+    def _source_sample_percent(self, environment: str,
+                               relationship: Dict[str, str]) -> Optional[float]:
+        """Sample percentage for the relationship's source table, if any."""
+        if not self.sample_threshold_rows:
+            return None
+        cache_key = (environment, relationship['source_schema'],
+                     relationship['source_table'])
+        if self._reltuples_cache.get(cache_key, 0) >= self.sample_threshold_rows:
+            return self.SAMPLE_PERCENT
+        return None
+
+    @staticmethod
+    def _scale_sampled_stats(stats: Dict[str, Any], sample_percent: float) -> None:
+        """Scale block-sample counts up to full-table estimates, in place.
+
+        Plain counts scale linearly in expectation. Distinct counts are
+        scaled too but capped by the counts that bound them, since FK-style
+        high-cardinality columns repeat values rarely enough for
+        near-linear scaling; the raw within-sample figures stay under
+        sampled_* keys for the duplicate and fan-out logic, which compares
+        inside the sample. max_duplicates stays a within-sample figure — a
+        sampled maximum cannot be scaled up meaningfully.
+        """
+        scale = 100.0 / sample_percent
+        stats['sampled_rows'] = stats['total_rows']
+        stats['sampled_unique_values'] = stats['unique_values']
+        stats['sampled_matching_records'] = stats['matching_records']
+        stats['sampled_matching_unique_source'] = stats['matching_unique_source']
+
+        for key in ('total_rows', 'non_null_values', 'null_values',
+                    'matching_records', 'orphaned_records'):
+            stats[key] = int(stats[key] * scale)
+        stats['unique_values'] = min(
+            int(stats['sampled_unique_values'] * scale), stats['non_null_values'])
+        stats['matching_unique_source'] = min(
+            int(stats['sampled_matching_unique_source'] * scale),
+            stats['unique_values'])
+        stats['matching_unique_target'] = min(
+            int(stats['matching_unique_target'] * scale),
+            stats['target_unique_values'])
+
+        stats['source_stats_sampled'] = True
+        stats['sample_percent'] = sample_percent
+
+    def _prepared_query(self, environment: str, query: str) -> List[Dict]:
+        """Execute an identifier-built statement via a server-side plan.
+
+        Identifiers cannot be bound as parameters, so each distinct SQL
+        text gets a PREPARE name derived from its hash; repeated executions
+        of the same relationship or column query on a pooled connection
+        then skip parse+plan entirely.
+        """
+        name = f"card_{hashlib.sha1(query.encode('utf-8')).hexdigest()[:12]}"
+        return self.db_connection.prepared_execute(environment, name, query)
+
+    def _unique_columns(self, environment: str) -> set:
+        """Single-column PK/UNIQUE columns as (schema, table, column) keys.
+
+        One metadata query per environment; multi-column constraints are
+        excluded since they guarantee nothing about one column alone.
+        """
+        cached = self._unique_cols_cache.get(environment)
+        if cached is not None:
+            return cached
+
+        query = """
+        SELECT
+            tc.table_schema,
+            tc.table_name,
+            min(kcu.column_name) as column_name
+        FROM information_schema.table_constraints tc
+        JOIN information_schema.key_column_usage kcu
+            ON kcu.constraint_name = tc.constraint_name
+            AND kcu.table_schema = tc.table_schema
+        WHERE tc.constraint_type IN ('PRIMARY KEY', 'UNIQUE')
+        GROUP BY tc.constraint_name, tc.table_schema, tc.table_name
+        HAVING count(*) = 1
+        """
+        try:
+            unique_cols = {
+                (row['table_schema'], row['table_name'], row['column_name'])
+                for row in self.db_connection.execute_query(environment, query)
+            }
+        except Exception as e:
+            logger.warning(f"Unique-column metadata query failed for "
+                           f"{environment}: {e}")
+            unique_cols = set()
+
+        self._unique_cols_cache[environment] = unique_cols
+        return unique_cols
+
+    @staticmethod
+    def _column_stats_subquery(col_id: int, schema: str, table: str,
+                               column: str, known_unique: bool = False) -> str:
+        """Build one column's count/distinct/non-null SELECT, tagged col_id.
+
+        For columns with a declared single-column PK/UNIQUE constraint the
+        distinct count equals the non-null count, so the expensive
+        count(DISTINCT) is skipped.
+        """
+        unique_expr = (f'count("{column}")' if known_unique
+                       else f'count(DISTINCT "{column}")')
+        return f"""
+        SELECT
+            {col_id} as col_id,
+            count(*) as total_rows,
+            {unique_expr} as unique_values,
+            count("{column}") as non_null_values
+        FROM "{schema}"."{table}"
+        """
+
+    def _get_column_stats(self, environment: str, schema: str, table: str,
+                          column: str) -> Dict[str, Any]:
+        """Fetch per-column statistics, memoized across relationships.
+
+        Declared and potential FKs reference the same PK columns over and
+        over; one count query per distinct column replaces one per
+        relationship.
+        """
+        cache_key = (environment, schema, table, column)
+        with self._col_stats_lock:
+            cached = self._col_stats_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        known_unique = (schema, table, column) in self._unique_columns(environment)
+        query = self._column_stats_subquery(0, schema, table, column,
+                                            known_unique=known_unique)
+        stats = dict(self._prepared_query(environment, query)[0])
+        stats.pop('col_id', None)
+        with self._col_stats_lock:
+            self._col_stats_cache[cache_key] = stats
+        return stats
+
+    def _warm_from_catalog_stats(self, environment: str,
+                                 pending: List[tuple]) -> List[tuple]:
+        """Fill the cache from pg_stats for large analyzed tables.
+
+        Classification only needs ratios rounded to two decimals, so the
+        planner's n_distinct/null_frac estimates replace count(DISTINCT)
+        scans on big targets. Returns the keys that still need an exact
+        pass (small, unanalyzed, or statless columns).
+        """
+        query = """
+        SELECT
+            n.nspname as schemaname,
+            c.relname as tablename,
+            s.attname,
+            greatest(c.reltuples::bigint, 0) as total_rows,
+            s.n_distinct,
+            s.null_frac
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        JOIN pg_stats s ON s.schemaname = n.nspname AND s.tablename = c.relname
+        WHERE (s.schemaname, s.tablename, s.attname) IN %s
+        """
+        columns = tuple((schema, table, column)
+                        for _, schema, table, column in pending)
+        try:
+            rows = self.db_connection.execute_query(environment, query, (columns,))
+        except Exception as e:
+            logger.warning(f"pg_stats warmup failed ({len(pending)} columns): {e}")
+            return pending
+
+        estimated = set()
+        for row in rows:
+            if row['total_rows'] < self.APPROX_MIN_ROWS or row['n_distinct'] is None:
+                continue
+            total_rows = row['total_rows']
+            n_distinct = float(row['n_distinct'])
+            # Negative n_distinct is a fraction of the row count
+            unique_values = int(-n_distinct * total_rows) if n_distinct < 0 \
+                else int(n_distinct)
+            non_null_values = int(total_rows * (1 - float(row['null_frac'] or 0)))
+            stats = {
+                'total_rows': total_rows,
+                'unique_values': min(unique_values, non_null_values),
+                'non_null_values': non_null_values,
+                'is_estimate': True
+            }
+            cache_key = (environment, row['schemaname'], row['tablename'],
+                         row['attname'])
+            with self._col_stats_lock:
+                self._col_stats_cache[cache_key] = stats
+            estimated.add(cache_key)
+
+        return [key for key in pending if key not in estimated]
+
+    def _warm_column_stats_cache(self, environment: str,
+                                 relationships: List[Dict[str, str]]) -> None:
+        """Pre-fill the column-stats cache for all distinct target columns.
+
+        Large analyzed targets are served from pg_stats estimates first; the
+        rest share one exact UNION ALL statement instead of a lazy query per
+        distinct column. A failed warmup just leaves the lazy path to fill
+        the cache.
+        """
+        pending = []
+        for relationship in relationships:
+            cache_key = (environment, relationship['target_schema'],
+                         relationship['target_table'], relationship['target_column'])
+            if cache_key not in self._col_stats_cache and cache_key not in pending:
+                pending.append(cache_key)
+        if not pending:
+            return
+
+        if self.use_approx:
+            pending = self._warm_from_catalog_stats(environment, pending)
+        if not pending:
+            return
+
+        unique_cols = self._unique_columns(environment)
+        query = "\nUNION ALL\n".join(
+            self._column_stats_subquery(
+                col_id, schema, table, column,
+                known_unique=(schema, table, column) in unique_cols
             )
-            SELECT 
-                s.*,
-                t.total_rows as target_total_rows,
-                t.unique_values as target_unique_values,
-                t.non_null_values as target_non_null_values,
-                r.matching_records,
-                r.matching_unique_source,
-                r.matching_unique_target,
-                o.orphaned_records
-            FROM source_analysis s, target_analysis t, relationship_analysis r, orphan_analysis o
-            """
-            
-            result = self.db_connection.execute_query(environment, analysis_query)
-            
-            if not result:
-                return self._create_failed_analysis(relationship)
-            
-            stats = result[0]
-            
-            # Determine cardinality pattern
-            cardinality_pattern = self._determine_cardinality_pattern(stats)
-            
-            # Calculate relationship quality metrics
-            quality_metrics = self._calculate_relationship_quality(stats)
-            
-            # Business insights
-            business_insights = self._generate_business_insights(
-                relationship, cardinality_pattern, quality_metrics
+            for col_id, (_, schema, table, column) in enumerate(pending)
+        )
+        try:
+            for row in self.db_connection.execute_query(environment, query):
+                stats = dict(row)
+                col_id = stats.pop('col_id')
+                with self._col_stats_lock:
+                    self._col_stats_cache[pending[col_id]] = stats
+        except Exception as e:
+            logger.warning(f"Column-stats cache warmup failed "
+                           f"({len(pending)} columns): {e}")
+
+    def _get_target_stats(self, environment: str,
+                          relationship: Dict[str, str]) -> Dict[str, Any]:
+        """Target-column statistics under the target_-prefixed stat keys."""
+        stats = self._get_column_stats(
+            environment, relationship['target_schema'],
+            relationship['target_table'], relationship['target_column']
+        )
+        return {
+            'target_total_rows': stats['total_rows'],
+            'target_unique_values': stats['unique_values'],
+            'target_non_null_values': stats['non_null_values'],
+            'target_stats_estimated': stats.get('is_estimate', False)
+        }
+
+    def _fetch_relationship_stats_batch(self, environment: str,
+                                        relationships: List[Dict[str, str]]
+                                        ) -> List[Optional[Dict]]:
+        """Fetch statistics for many relationships in few round trips.
+
+        Per-relationship subqueries are UNION ALLed into compound statements
+        capped at BATCH_SQL_SIZE_CAP of SQL text, cutting round trips from
+        O(R) to O(1) for typical schemas. When the cap forces several
+        batches they run concurrently on pooled connections, overlapping
+        server-side wall time. A failing batch falls back to the
+        single-relationship path so one bad relationship cannot sink its
+        batchmates.
+        """
+        results: List[Optional[Dict]] = [None] * len(relationships)
+
+        self._warm_column_stats_cache(environment, relationships)
+        self._warm_reltuples(environment, relationships)
+        sample_percents = [self._source_sample_percent(environment, relationship)
+                           for relationship in relationships]
+
+        batches: List[List[Tuple[int, str]]] = []
+        batch: List[Tuple[int, str]] = []
+        batch_size = 0
+        for rel_id, relationship in enumerate(relationships):
+            subquery = self._relationship_stats_subquery(
+                rel_id, relationship, sample_percents[rel_id]
             )
-            
-            return {
-                'source_table': f"{relationship['source_schema']}.{relationship['source_table']}",
-                'source_column': relationship['source_column'],
-                'target_table': f"{relationship['target_schema']}.{relationship['target_table']}",
-                'target_column': relationship['target_column'],
-                'cardinality_pattern': cardinality_pattern,
-                'quality_metrics': quality_metrics,
-                'detailed_statistics': dict(stats),
-                'business_insights': business_insights
-            }
-            
+            if batch and batch_size + len(subquery) > self.BATCH_SQL_SIZE_CAP:
+                batches.append(batch)
+                batch, batch_size = [], 0
+            batch.append((rel_id, subquery))
+            batch_size += len(subquery)
+        if batch:
+            batches.append(batch)
+
+        def run_batch(current: List[Tuple[int, str]]) -> None:
+            query = "\nUNION ALL\n".join(subquery for _, subquery in current)
+            try:
+                rows = self.db_connection.execute_query(environment, query)
+                for row in rows:
+                    stats = dict(row)
+                    rel_id = stats.pop('rel_id')
+                    stats.update(self._get_target_stats(
+                        environment, relationships[rel_id]
+                    ))
+                    if sample_percents[rel_id]:
+                        self._scale_sampled_stats(stats, sample_percents[rel_id])
+                    results[rel_id] = stats
+            except Exception as e:
+                logger.warning(f"Batched relationship analysis failed "
+                               f"({len(current)} relationships), retrying "
+                               f"individually: {e}")
+                for rel_id, _ in current:
+                    results[rel_id] = self._fetch_relationship_stats(
+                        environment, relationships[rel_id],
+                        sample_percent=sample_percents[rel_id]
+                    )
+
+        if len(batches) > 1:
+            workers = min(len(batches), self.FETCH_MAX_WORKERS)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                # Each worker draws its own pooled connection; results slots
+                # are disjoint per batch, so no shared-state races
+                list(executor.map(run_batch, batches))
+        else:
+            for current in batches:
+                run_batch(current)
+
+        return results
+
+    def _fetch_relationship_stats(self, environment: str,
+                                  relationship: Dict[str, str],
+                                  sample_percent: Optional[float] = None
+                                  ) -> Optional[Dict]:
+        """Fetch raw cardinality statistics for a single relationship."""
+        try:
+            query = self._relationship_stats_subquery(0, relationship,
+                                                      sample_percent)
+            result = self._prepared_query(environment, query)
+            if not result:
+                return None
+
+            stats = dict(result[0])
+            stats.pop('rel_id', None)
+            stats.update(self._get_target_stats(environment, relationship))
+            if sample_percent:
+                self._scale_sampled_stats(stats, sample_percent)
+            return stats
+
         except Exception as e:
             logger.warning(f"Failed to analyze relationship {relationship}: {e}")
-            return self._create_failed_analysis(relationship)
-    
-    def _determine_cardinality_pattern(self, stats: Dict) -> Dict[str, Any]:
+            return None
+
+    @staticmethod
+    def _determine_cardinality_pattern(stats: Dict) -> Dict[str, Any]:
         """Determine the cardinality pattern from statistics."""
         source_total = stats['total_rows']
         source_unique = stats['unique_values']
         target_total = stats['target_total_rows']
         target_unique = stats['target_unique_values']
         matching_records = stats['matching_records']
-        
-        # Check for uniqueness on both sides
-        source_has_duplicates = source_unique < source_total if source_total > 0 else False
-        target_has_duplicates = target_unique < target_total if target_total > 0 else False
+        matching_unique_source = stats['matching_unique_source']
+
+        # Check for uniqueness on both sides. Source counts are exact from
+        # the join scan; target counts may be planner estimates, so their
+        # comparison tolerates ~1% estimation noise
+        if stats.get('source_stats_sampled'):
+            # Sampled source: detect duplicates and fan-out inside the raw
+            # sample — those ratios are scale-free, whereas mixing scaled
+            # and capped figures would bias both. The tolerance absorbs
+            # block-sampling noise
+            source_total = stats['sampled_rows']
+            source_unique = stats['sampled_unique_values']
+            matching_records = stats['sampled_matching_records']
+            matching_unique_source = stats['sampled_matching_unique_source']
+            source_has_duplicates = source_unique < source_total * 0.99
+        else:
+            source_has_duplicates = source_unique < source_total if source_total > 0 else False
+        if stats.get('target_stats_estimated'):
+            target_has_duplicates = target_unique < target_total * 0.99
+        else:
+            target_has_duplicates = target_unique < target_total if target_total > 0 else False
         
         # Determine pattern
         if not source_has_duplicates and not target_has_duplicates:
@@ -212,8 +783,8 @@ class CardinalityAnalyzer:
             description = "Complex relationship with duplicates on both sides"
         
         # Calculate average fan-out
-        if matching_records > 0 and stats['matching_unique_source'] > 0:
-            avg_fanout = matching_records / stats['matching_unique_source']
+        if matching_records > 0 and matching_unique_source > 0:
+            avg_fanout = matching_records / matching_unique_source
         else:
             avg_fanout = 0
         
@@ -226,40 +797,39 @@ class CardinalityAnalyzer:
             'max_duplicates_per_value': stats.get('max_duplicates', 0)
         }
     
-    def _calculate_relationship_quality(self, stats: Dict) -> Dict[str, Any]:
-        """Calculate quality metrics for the relationship."""
-        total_source = stats['non_null_values']
-        matching = stats['matching_records']
+    @staticmethod
+    def _calculate_relationship_quality(stats: Dict) -> Dict[str, Any]:
+        """Assemble quality metrics for the relationship.
+
+        Integrity and completeness arrive pre-rounded from the SQL CASE
+        columns (NULL when the denominator is zero); only the density score
+        needs Python arithmetic, since its denominator comes from the
+        memoized target stats rather than the join scan.
+        """
         orphaned = stats['orphaned_records']
-        
-        # Referential integrity score
-        if total_source > 0:
-            integrity_score = ((total_source - orphaned) / total_source) * 100
-        else:
-            integrity_score = 0
-        
-        # Data completeness score
-        if stats['total_rows'] > 0:
-            completeness_score = (stats['non_null_values'] / stats['total_rows']) * 100
-        else:
-            completeness_score = 0
-        
+
+        integrity_score = stats.get('integrity_score')
+        completeness_score = stats.get('completeness_score')
+
         # Relationship density (how much of target is actually referenced)
         if stats['target_unique_values'] > 0:
             density_score = (stats['matching_unique_target'] / stats['target_unique_values']) * 100
         else:
             density_score = 0
-        
+
         return {
-            'referential_integrity_score': round(integrity_score, 2),
-            'data_completeness_score': round(completeness_score, 2),
+            'referential_integrity_score': float(integrity_score)
+                if integrity_score is not None else 0,
+            'data_completeness_score': float(completeness_score)
+                if completeness_score is not None else 0,
             'relationship_density_score': round(density_score, 2),
             'has_orphaned_records': orphaned > 0,
             'orphaned_record_count': orphaned,
-            'matching_record_count': matching
+            'matching_record_count': stats['matching_records']
         }
     
-    def _generate_business_insights(self, relationship: Dict, 
+    @staticmethod
+    def _generate_business_insights(relationship: Dict,
                                   cardinality: Dict, quality: Dict) -> List[str]:
         """Generate business insights from the relationship analysis."""
         insights = []
@@ -294,70 +864,109 @@ class CardinalityAnalyzer:
         
         return insights
     
-    def _categorize_cardinalities(self, all_relationships: List[Dict]) -> Dict[str, Any]:
-        """Categorize relationships by their cardinality patterns."""
-        categories = {
-            'one_to_one': [],
-            'one_to_many': [],
-            'many_to_one': [],
-            'many_to_many': [],
-            'failed_analysis': []
-        }
-        
+    # Cardinality patterns recognized by the categorizer
+    CARDINALITY_PATTERNS = ('one_to_one', 'one_to_many', 'many_to_one',
+                            'many_to_many', 'failed_analysis')
+
+    def _categorize_cardinalities(self, all_relationships: List[RelationshipCardinality],
+                                  stream_dir: Optional[str] = None) -> Dict[str, Any]:
+        """Categorize relationships by their cardinality patterns.
+
+        Pattern grouping stays a Python loop (attribute reads on the slots
+        records); the numeric quality bucketing runs as mask counts over
+        two column arrays instead of branching per relationship.
+
+        With `stream_dir` set, each relationship is appended to a
+        per-pattern gzipped NDJSON shard instead of being grouped into
+        in-memory lists, and the result carries shard paths rather than
+        detailed_categories — peak memory and report size stay flat for
+        large relationship sets.
+        """
+        categories = {name: [] for name in self.CARDINALITY_PATTERNS}
+
+        if stream_dir is not None:
+            os.makedirs(stream_dir, exist_ok=True)
+            pattern_files = {
+                name: os.path.join(stream_dir, f"{name}.jsonl.gz")
+                for name in self.CARDINALITY_PATTERNS
+            }
+            handles = {name: gzip.open(path, 'wb')
+                       for name, path in pattern_files.items()}
+            pattern_counts = {name: 0 for name in self.CARDINALITY_PATTERNS}
+
+        try:
+            for rel in all_relationships:
+                pattern = rel.pattern
+                if pattern not in categories:
+                    pattern = 'failed_analysis'
+                if stream_dir is not None:
+                    handles[pattern].write(_dumps_line(rel.to_dict()))
+                    pattern_counts[pattern] += 1
+                else:
+                    categories[pattern].append(rel.to_dict())
+        finally:
+            if stream_dir is not None:
+                for handle in handles.values():
+                    handle.close()
+
+        count = len(all_relationships)
+        integrity = np.fromiter(
+            (rel.integrity_score for rel in all_relationships),
+            dtype=np.float64, count=count
+        )
+        orphaned = np.fromiter(
+            (rel.has_orphaned_records for rel in all_relationships),
+            dtype=np.bool_, count=count
+        )
+
         quality_summary = {
-            'high_integrity': 0,  # >95%
-            'medium_integrity': 0,  # 80-95%
-            'low_integrity': 0,  # <80%
-            'orphaned_relationships': 0
+            'high_integrity': int(np.count_nonzero(integrity > 95)),  # >95%
+            'medium_integrity': int(np.count_nonzero(
+                (integrity >= 80) & (integrity <= 95))),  # 80-95%
+            'low_integrity': int(np.count_nonzero(integrity < 80)),  # <80%
+            'orphaned_relationships': int(np.count_nonzero(orphaned))
         }
-        
-        for rel in all_relationships:
-            pattern = rel.get('cardinality_pattern', {}).get('pattern', 'failed_analysis')
-            if pattern in categories:
-                categories[pattern].append(rel)
-            else:
-                categories['failed_analysis'].append(rel)
-            
-            # Quality categorization
-            integrity_score = rel.get('quality_metrics', {}).get('referential_integrity_score', 0)
-            if integrity_score > 95:
-                quality_summary['high_integrity'] += 1
-            elif integrity_score >= 80:
-                quality_summary['medium_integrity'] += 1
-            else:
-                quality_summary['low_integrity'] += 1
-            
-            if rel.get('quality_metrics', {}).get('has_orphaned_records', False):
-                quality_summary['orphaned_relationships'] += 1
-        
+
+        if stream_dir is not None:
+            return {
+                'pattern_distribution': pattern_counts,
+                'quality_distribution': quality_summary,
+                'pattern_files': pattern_files
+            }
         return {
             'pattern_distribution': {k: len(v) for k, v in categories.items()},
             'quality_distribution': quality_summary,
             'detailed_categories': categories
         }
     
-    def _create_failed_analysis(self, relationship: Dict) -> Dict[str, Any]:
-        """Create a placeholder for failed relationship analysis."""
-        return {
-            'source_table': f"{relationship['source_schema']}.{relationship['source_table']}",
-            'source_column': relationship['source_column'],
-            'target_table': f"{relationship['target_schema']}.{relationship['target_table']}",
-            'target_column': relationship['target_column'],
-            'cardinality_pattern': {'pattern': 'analysis_failed'},
-            'quality_metrics': {},
-            'detailed_statistics': {},
-            'business_insights': ['Analysis failed - unable to determine relationship characteristics']
-        }
+    @staticmethod
+    def _create_failed_analysis(relationship: Dict) -> RelationshipCardinality:
+        """Create a placeholder record for failed relationship analysis."""
+        return RelationshipCardinality(
+            source_table=f"{relationship['source_schema']}.{relationship['source_table']}",
+            source_column=relationship['source_column'],
+            target_table=f"{relationship['target_schema']}.{relationship['target_table']}",
+            target_column=relationship['target_column'],
+            pattern='failed_analysis',
+            cardinality_pattern={'pattern': 'analysis_failed'},
+            quality_metrics={},
+            business_insights=['Analysis failed - unable to determine relationship characteristics']
+        )
     
     def generate_cardinality_report(self, environment: str) -> str:
         """Generate comprehensive cardinality analysis report."""
         logger.info(f"Generating cardinality analysis report for {environment}")
         
         report = ArchaeologyReport(environment)
-        
+
         try:
-            # Perform comprehensive cardinality analysis
-            cardinality_analysis = self.analyze_all_relationships(environment)
+            # Perform comprehensive cardinality analysis; per-pattern detail
+            # lists stream to gzipped shards beside the report instead of
+            # inflating the report JSON itself
+            shard_dir = f"layer2_cardinality_categories_{environment}_{generate_timestamp()}"
+            cardinality_analysis = self.analyze_all_relationships(
+                environment, stream_categories_to=shard_dir
+            )
             
             # Add sections to report
             report.add_section('cardinality_analysis', cardinality_analysis)
@@ -6,9 +6,11 @@ This module systematically identifies the "anchor" of each table - the unique id
 that serves as the foundation for all relationships and data integrity.
 """
 
+import concurrent.futures
 import logging
 import sys
 import os
+from collections import defaultdict
 from typing import Dict, List, Any, Optional, Tuple
 
 # Handle relative imports for both package usage and direct execution
@@ -51,9 +53,11 @@ class PrimaryKeyDetective:
         GROUP BY tc.table_schema, tc.table_name, tc.constraint_name
         ORDER BY tc.table_schema, tc.table_name
         """
-        
+
         try:
-            declared_pks = self.db_connection.execute_query(environment, query)
+            # Catalog contents are static for the duration of a run, so the
+            # result rides the session query cache across repeated calls
+            declared_pks = self.db_connection.cached_query(environment, query)
             
             # Categorize by complexity
             single_column_pks = [pk for pk in declared_pks if pk['column_count'] == 1]
@@ -109,24 +113,41 @@ class PrimaryKeyDetective:
             params = None
         
         try:
-            tables = self.db_connection.execute_query(environment, tables_query, params)
-            
+            tables = self.db_connection.cached_query(environment, tables_query, params)
+
+            # All column metadata for the scope arrives in one memoized
+            # query instead of one information_schema round trip per table
+            columns_by_table = self._fetch_table_columns(environment, schema_name)
+
             natural_keys = []
             tables_without_natural_keys = []
-            
-            for table in tables:
-                schema = table['table_schema']
-                table_name = table['table_name']
-                
-                # Find potential natural keys for this table
-                table_natural_keys = self._analyze_table_for_natural_keys(
-                    environment, schema, table_name
+
+            # Each table's analysis is dominated by DB wait, so tables fan
+            # out over pooled connections; results come back in table
+            # order via map. Tiny schemas skip the executor overhead.
+            def analyze(table):
+                key = (table['table_schema'], table['table_name'])
+                return self._analyze_table_for_natural_keys(
+                    environment, table['table_schema'], table['table_name'],
+                    columns_by_table.get(key, [])
                 )
-                
+
+            if len(tables) < 3:
+                results = [analyze(table) for table in tables]
+            else:
+                workers = min(
+                    len(tables),
+                    self.db_connection.max_parallel_cardinality_queries(environment)
+                )
+                with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(analyze, tables))
+
+            for table, table_natural_keys in zip(tables, results):
                 if table_natural_keys:
                     natural_keys.extend(table_natural_keys)
                 else:
-                    tables_without_natural_keys.append(f"{schema}.{table_name}")
+                    tables_without_natural_keys.append(
+                        f"{table['table_schema']}.{table['table_name']}")
             
             logger.info(f"Found {len(natural_keys)} natural key candidates")
             
@@ -146,61 +167,98 @@ class PrimaryKeyDetective:
             logger.error(f"Natural primary key discovery failed: {e}")
             raise
     
-    def _analyze_table_for_natural_keys(self, environment: str, 
-                                      schema_name: str, table_name: str) -> List[Dict[str, Any]]:
-        """Analyze a single table for natural primary key candidates."""
-        try:
-            # Get table row count first
-            count_query = f'SELECT count(*) as row_count FROM "{schema_name}"."{table_name}"'
-            count_result = self.db_connection.execute_query(environment, count_query)
-            row_count = count_result[0]['row_count'] if count_result else 0
-            
-            if row_count == 0:
-                return []
-            
-            # Get columns to test
-            columns_query = """
-            SELECT column_name, data_type, is_nullable
+    # Data types that cannot sensibly serve as a primary key; skipping
+    # them keeps the hash aggregates out of unbounded-width columns
+    _NON_KEY_DATA_TYPES = {'json', 'jsonb', 'bytea', 'xml', 'ARRAY'}
+
+    def _fetch_table_columns(self, environment: str,
+                             schema_name: Optional[str] = None
+                             ) -> Dict[Tuple[str, str], List[Dict]]:
+        """Column metadata for every table in scope, one memoized query.
+
+        Grouped by (schema, table) so per-table analyzers receive their
+        slice without touching information_schema again.
+        """
+        if schema_name:
+            query = """
+            SELECT table_schema, table_name, column_name, data_type, is_nullable
             FROM information_schema.columns
-            WHERE table_schema = %s AND table_name = %s
-            ORDER BY ordinal_position
+            WHERE table_schema = %s
+            ORDER BY table_schema, table_name, ordinal_position
             """
-            
-            columns = self.db_connection.execute_query(
-                environment, columns_query, (schema_name, table_name)
-            )
-            
+            params = (schema_name,)
+        else:
+            query = """
+            SELECT table_schema, table_name, column_name, data_type, is_nullable
+            FROM information_schema.columns
+            WHERE table_schema NOT IN ('information_schema', 'pg_catalog')
+            AND table_schema NOT LIKE 'pg_%'
+            ORDER BY table_schema, table_name, ordinal_position
+            """
+            params = None
+
+        rows = self.db_connection.cached_query(environment, query, params)
+        grouped: Dict[Tuple[str, str], List[Dict]] = defaultdict(list)
+        for row in rows:
+            grouped[(row['table_schema'], row['table_name'])].append(row)
+        return grouped
+
+    def _analyze_table_for_natural_keys(self, environment: str,
+                                      schema_name: str, table_name: str,
+                                      columns: Optional[List[Dict]] = None
+                                      ) -> List[Dict[str, Any]]:
+        """Analyze a single table for natural primary key candidates.
+
+        All candidate columns are tested in one aggregate query — count(*)
+        plus count(DISTINCT)/count() per column — so the table is scanned
+        once instead of once per column plus a separate row count. Pass
+        `columns` to reuse prefetched metadata; without it the column
+        list comes from a memoized catalog query.
+        """
+        try:
+            if columns is None:
+                columns = self._fetch_table_columns(environment).get(
+                    (schema_name, table_name), [])
+
+            testable = [column for column in columns
+                        if column['data_type'] not in self._NON_KEY_DATA_TYPES]
+            if not testable:
+                return []
+
+            # One scan covers the row count and every column's uniqueness
+            # and non-null figures
+            select_parts = ['count(*) as total_rows']
+            for col_id, column in enumerate(testable):
+                column_name = column['column_name']
+                select_parts.append(f'count(DISTINCT "{column_name}") as d{col_id}')
+                select_parts.append(f'count("{column_name}") as n{col_id}')
+            stats_query = (f'SELECT {", ".join(select_parts)} '
+                           f'FROM "{schema_name}"."{table_name}"')
+
+            result = self.db_connection.execute_query(environment, stats_query)
+            stats = result[0] if result else {}
+            total_rows = stats.get('total_rows', 0)
+
+            if total_rows == 0:
+                return []
+
             natural_keys = []
-            
-            for column in columns:
+
+            for col_id, column in enumerate(testable):
                 column_name = column['column_name']
-                
-                # Test for uniqueness and non-nullability
-                uniqueness_query = f"""
-                SELECT 
-                    count(*) as total_rows,
-                    count(DISTINCT "{column_name}") as distinct_values,
-                    count("{column_name}") as non_null_values
-                FROM "{schema_name}"."{table_name}"
-                """
-                
-                result = self.db_connection.execute_query(environment, uniqueness_query)
-                stats = result[0] if result else {}
-                
-                total_rows = stats.get('total_rows', 0)
-                distinct_values = stats.get('distinct_values', 0)
-                non_null_values = stats.get('non_null_values', 0)
-                
+                distinct_values = stats.get(f'd{col_id}', 0)
+                non_null_values = stats.get(f'n{col_id}', 0)
+
                 # Check if this column qualifies as a natural primary key
                 is_unique = distinct_values == total_rows
                 is_non_null = non_null_values == total_rows
-                
-                if is_unique and is_non_null and total_rows > 0:
+
+                if is_unique and is_non_null:
                     # Additional analysis for confidence scoring
                     confidence_score = self._calculate_primary_key_confidence(
                         column_name, column['data_type'], total_rows
                     )
-                    
+
                     natural_key = {
                         'schema_name': schema_name,
                         'table_name': table_name,
@@ -211,11 +269,11 @@ class PrimaryKeyDetective:
                         'confidence_score': confidence_score,
                         'key_characteristics': self._analyze_key_characteristics(column_name, column['data_type'])
                     }
-                    
+
                     natural_keys.append(natural_key)
-            
+
             return natural_keys
-            
+
         except Exception as e:
             logger.warning(f"Failed to analyze {schema_name}.{table_name} for natural keys: {e}")
             return []
@@ -319,7 +377,7 @@ class PrimaryKeyDetective:
             AND table_type = 'BASE TABLE'
             """
             
-            all_tables = self.db_connection.execute_query(environment, all_tables_query)
+            all_tables = self.db_connection.cached_query(environment, all_tables_query)
             tables_with_declared_pk = set((pk['table_schema'], pk['table_name']) for pk in declared_pks)
             tables_with_natural_key = set((nk['schema_name'], nk['table_name']) for nk in natural_keys)
             
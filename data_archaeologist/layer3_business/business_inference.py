@@ -41,9 +41,9 @@ class BusinessProcessInference:
                 t.table_schema,
                 t.table_name,
                 COALESCE(s.n_live_tup, 0) as estimated_rows,
-                pg_size_pretty(pg_total_relation_size(t.table_schema||'.'||t.table_name)) as table_size
+                pg_size_pretty(pg_total_relation_size(s.relid)) as table_size
             FROM information_schema.tables t
-            LEFT JOIN pg_stat_user_tables s 
+            LEFT JOIN pg_stat_user_tables s
                 ON t.table_schema = s.schemaname AND t.table_name = s.tablename
             WHERE t.table_schema NOT IN ('information_schema', 'pg_catalog')
             AND t.table_schema NOT LIKE 'pg_%'